@@ -75,7 +75,7 @@ def validate_request_size():
     max_size_mb = current_app.config.get("MAX_UPLOAD_SIZE_MB", 50)
     max_size_bytes = max_size_mb * 1024 * 1024
 
-    # Check Content-Length header
+    # Check Content-Length header only; the body is never read here
     content_length = request.content_length
     if content_length and content_length > max_size_bytes:
         logger.warning(
@@ -1,16 +1,32 @@
 """Authentication and authorization utilities."""
 
+import hashlib
+import http.cookiejar
 import logging
 import os
+import threading
+import time
 from functools import wraps
 
 import requests
 from flask import request, session
+from jose import JWTError, jwt
 
 from error_handlers import APIError
 
 logger = logging.getLogger(__name__)
 
+# Shared across requests so the connection to the OIDC provider is kept alive.
+# Cookies are refused so nothing set for one user's call rides along on the next.
+_SESSION = requests.Session()
+_SESSION.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+
+# Successful userinfo lookups, keyed by token hash: {key: (expires_at, userinfo)}
+USERINFO_CACHE_TTL = float(os.getenv("USERINFO_CACHE_TTL", "300"))
+USERINFO_CACHE_MAX_SIZE = 10_000
+_userinfo_cache = {}
+_userinfo_cache_lock = threading.Lock()
+
 
 def session_required(f):
     """Decorator to ensure the request has a valid session."""
@@ -35,8 +51,7 @@ def make_userinfo_request(token):
     headers = {"Authorization": f"Bearer {token}"}
 
     try:
-        with requests.Session() as session:
-            response = session.get(userinfo_endpoint, headers=headers, timeout=5)
+        response = _SESSION.get(userinfo_endpoint, headers=headers, timeout=5)
         response.raise_for_status()
         userinfo = response.json()
         logger.info(f'Userinfo request successful: {userinfo.get("name")}')
@@ -48,6 +63,55 @@ def make_userinfo_request(token):
         )
 
 
+def _token_expiry(token):
+    """Return the ``exp`` claim of a JWT access token, or None if it has none.
+
+    The signature is not checked; the claim only shortens how long a lookup
+    the OIDC provider already accepted is trusted. Opaque tokens return None.
+    """
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return exp if isinstance(exp, (int, float)) else None
+
+
+def get_cached_userinfo(token):
+    """Return userinfo for the token, reusing a recent successful lookup.
+
+    Lookups are trusted for USERINFO_CACHE_TTL seconds, or until the token's
+    ``exp`` claim if that comes first. Failed validations are never cached,
+    so a rejected token is re-checked against the OIDC provider on every
+    request.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.monotonic()
+    with _userinfo_cache_lock:
+        entry = _userinfo_cache.get(key)
+    if entry and entry[0] > now:
+        return entry[1]
+
+    userinfo = make_userinfo_request(token)
+    expires_at = now + USERINFO_CACHE_TTL
+    exp = _token_expiry(token)
+    if exp is not None:
+        expires_at = min(expires_at, now + exp - time.time())
+    with _userinfo_cache_lock:
+        _userinfo_cache.pop(key, None)
+        if expires_at > now:
+            if len(_userinfo_cache) >= USERINFO_CACHE_MAX_SIZE:
+                # Evict the oldest entry; dicts keep insertion order
+                del _userinfo_cache[next(iter(_userinfo_cache))]
+            _userinfo_cache[key] = (expires_at, userinfo)
+    return userinfo
+
+
+def clear_userinfo_cache():
+    """Drop all cached userinfo lookups."""
+    with _userinfo_cache_lock:
+        _userinfo_cache.clear()
+
+
 def get_user_from_request():
     """Extract and validate user info from Authorization header."""
     auth_header = request.headers.get("Authorization")
@@ -59,5 +123,5 @@ def get_user_from_request():
         raise APIError("Invalid token format", status_code=401)
 
     token = parts[1]
-    user_info = make_userinfo_request(token)
+    user_info = get_cached_userinfo(token)
     return user_info, user_info.get("sub")
@@ -2,55 +2,94 @@
 
 import logging
 import os
+from functools import lru_cache
 
-from flask_cors import CORS
+import orjson
+from flask.json.provider import DefaultJSONProvider
 
-from utils import SizeValidationMiddleware
+# Static CORS rules, built once at import; only the frontend origin varies per app
+_PUBLIC_DATA_CORS = {
+    "origins": "*",  # Allow any origin for public story data
+    "methods": ("GET", "OPTIONS"),
+    "allow_headers": ("Content-Type", "Accept"),
+    "expose_headers": ("Content-Type",),
+}
+_PUBLIC_SESSION_DATA_CORS = {
+    "origins": "*",  # Allow any origin for public session data
+    "methods": ("GET", "HEAD", "OPTIONS"),
+    "allow_headers": ("Content-Type", "Accept"),
+    "expose_headers": ("Content-Type", "Content-Length"),
+}
+_KNOWN_ORIGINS = (
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "https://molstar.org",
+    "https://stories.molstar.org",
+)
+_DEFAULT_CORS = {
+    "methods": ("GET", "POST", "PUT", "DELETE", "OPTIONS"),
+    "allow_headers": (
+        "Authorization",
+        "Content-Type",
+        "Accept",
+        "Origin",
+        "X-Requested-With",
+    ),
+    "expose_headers": ("Content-Type",),
+    "supports_credentials": True,
+    "max_age": 86400,  # Cache preflight requests for 24 hours
+}
 
 
 def configure_cors(app):
     """Configure CORS for the Flask app."""
+    from flask_cors import CORS
+
+    frontend_url = os.getenv("FRONTEND_URL", "https://molstar.org/mol-view-stories/")
     CORS(
         app,
         resources={
-            r"/api/story/*/data": {
-                "origins": "*",  # Allow any origin for public story data
-                "methods": ["GET", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Accept"],
-                "expose_headers": ["Content-Type"],
-            },
-            r"/api/story/*/session-data": {
-                "origins": "*",  # Allow any origin for public session data
-                "methods": ["GET", "HEAD", "OPTIONS"],
-                "allow_headers": ["Content-Type", "Accept"],
-                "expose_headers": ["Content-Type", "Content-Length"],
-            },
-            r"/*": {
-                "origins": [
-                    "http://localhost:3000",
-                    "http://127.0.0.1:3000",
-                    "https://molstar.org",
-                    "https://stories.molstar.org",
-                    os.getenv("FRONTEND_URL", "https://molstar.org/mol-view-stories/"),
-                ],
-                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                "allow_headers": [
-                    "Authorization",
-                    "Content-Type",
-                    "Accept",
-                    "Origin",
-                    "X-Requested-With",
-                ],
-                "expose_headers": ["Content-Type"],
-                "supports_credentials": True,
-                "max_age": 86400,  # Cache preflight requests for 24 hours
-            },
+            r"/api/story/*/data": _PUBLIC_DATA_CORS,
+            r"/api/story/*/session-data": _PUBLIC_SESSION_DATA_CORS,
+            r"/*": {**_DEFAULT_CORS, "origins": [*_KNOWN_ORIGINS, frontend_url]},
         },
     )
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes responses with orjson.
+
+    Keeps Flask's sorted keys and falls back to its ``default`` for types
+    orjson does not handle natively (Decimal, ``__html__`` objects). Values
+    orjson refuses, such as integers wider than 64 bits, are encoded by the
+    stdlib provider instead. Request bodies are still decoded with the stdlib
+    ``json`` module so big integers keep their precision. Note that orjson
+    writes NaN and Infinity as ``null`` rather than the non-standard literals.
+    """
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+
+@lru_cache(maxsize=8)
+def _load_limits(max_sessions, max_stories, max_upload_size_mb):
+    """Coerce the limit env values to ints, cached per distinct combination."""
+    return int(max_sessions), int(max_stories), int(max_upload_size_mb)
+
+
 def configure_app(app):
     """Configure the Flask app with all necessary settings."""
+    from utils import SizeValidationMiddleware
+
+    app.json = ORJSONProvider(app)
 
     # OIDC configuration
     app.config["OIDC_USERINFO_URL"] = os.getenv(
@@ -66,12 +105,16 @@ def configure_app(app):
 
     # User limits configuration
     # TODO: Change to 10 after testing
-    app.config["MAX_SESSIONS_PER_USER"] = int(os.getenv("MAX_SESSIONS_PER_USER", "100"))
-    app.config["MAX_STORIES_PER_USER"] = int(os.getenv("MAX_STORIES_PER_USER", "100"))
+    max_sessions, max_stories, max_upload_size_mb = _load_limits(
+        os.getenv("MAX_SESSIONS_PER_USER", "100"),
+        os.getenv("MAX_STORIES_PER_USER", "100"),
+        os.getenv("MAX_UPLOAD_SIZE_MB", "50"),
+    )
+    app.config["MAX_SESSIONS_PER_USER"] = max_sessions
+    app.config["MAX_STORIES_PER_USER"] = max_stories
 
     # Upload size limit (configurable via environment variable)
-    max_upload_size_mb = int(os.getenv("MAX_UPLOAD_SIZE_MB", "50"))
-    max_size_bytes = max_upload_size_mb * 1024 * 1024
+    max_size_bytes = max_upload_size_mb << 20
     app.config["MAX_CONTENT_LENGTH"] = max_size_bytes
     app.config["MAX_UPLOAD_SIZE_MB"] = max_upload_size_mb  # Store for use in decorators
 
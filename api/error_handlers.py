@@ -32,6 +32,54 @@ def handle_api_error(error):
     return jsonify(response), error.status_code
 
 
+def _handle_api(e):
+    logger.error(f"API Error: {e.message}", extra={"details": e.details})
+    return handle_api_error(e)
+
+
+def _handle_too_large(e):
+    logger.warning(f"File size limit exceeded: {str(e)}")
+    return (
+        jsonify(
+            {
+                "error": True,
+                "message": "File size too large",
+                "status_code": 413,
+                "details": {
+                    "type": "RequestEntityTooLarge",
+                    "description": "The uploaded file exceeds the maximum allowed size of 50MB",
+                    "max_size_mb": 50,
+                    "suggestion": "Please reduce the file size and try again",
+                },
+            }
+        ),
+        413,
+    )
+
+
+def _handle_unexpected(e):
+    logger.exception("Unexpected error occurred")
+    return (
+        jsonify(
+            {
+                "error": True,
+                "message": "An unexpected error occurred",
+                "status_code": 500,
+                "details": {"type": type(e).__name__, "description": str(e)},
+            }
+        ),
+        500,
+    )
+
+
+# Exception type -> handler; subclasses resolve through their MRO
+_HANDLERS = {
+    APIError: _handle_api,
+    RequestEntityTooLarge: _handle_too_large,
+    Exception: _handle_unexpected,
+}
+
+
 def error_handler(f):
     """Decorator to handle errors in API endpoints."""
 
@@ -39,39 +87,12 @@ def error_handler(f):
     def decorated(*args, **kwargs):
         try:
             return f(*args, **kwargs)
-        except APIError as e:
-            logger.error(f"API Error: {e.message}", extra={"details": e.details})
-            return handle_api_error(e)
-        except RequestEntityTooLarge as e:
-            logger.warning(f"File size limit exceeded: {str(e)}")
-            return (
-                jsonify(
-                    {
-                        "error": True,
-                        "message": "File size too large",
-                        "status_code": 413,
-                        "details": {
-                            "type": "RequestEntityTooLarge",
-                            "description": "The uploaded file exceeds the maximum allowed size of 50MB",
-                            "max_size_mb": 50,
-                            "suggestion": "Please reduce the file size and try again",
-                        },
-                    }
-                ),
-                413,
-            )
         except Exception as e:
-            logger.exception("Unexpected error occurred")
-            return (
-                jsonify(
-                    {
-                        "error": True,
-                        "message": "An unexpected error occurred",
-                        "status_code": 500,
-                        "details": {"type": type(e).__name__, "description": str(e)},
-                    }
-                ),
-                500,
-            )
+            handler = _HANDLERS.get(type(e))
+            if handler is None:
+                handler = next(
+                    _HANDLERS[cls] for cls in type(e).__mro__ if cls in _HANDLERS
+                )
+            return handler(e)
 
     return decorated
@@ -14,8 +14,8 @@ from auth import get_user_from_request
 from error_handlers import APIError, error_handler
 from schemas import SessionUpdate
 from storage import (
-    MINIO_BUCKET,
     check_user_session_limit,
+    client,
     count_user_sessions,
     count_user_stories,
     create_metadata,
@@ -23,7 +23,6 @@ from storage import (
     delete_session_by_id,
     find_object_by_id,
     list_objects_by_type,
-    minio_client,
     save_object,
     update_session_by_id,
 )
@@ -297,12 +296,11 @@ def _update_session_json(session_id, user_id):
     logger.info(
         f"Update session request received for session_id: {session_id} by user: {user_id}"
     )
-    logger.debug(f"Validated input fields: {validated_input.dict(exclude_none=True)}")
+    update_fields = validated_input.dict(exclude_none=True)
+    logger.debug(f"Validated input fields: {update_fields}")
 
     # Perform the update with authorization check (this already checks ownership)
-    updated_metadata = update_session_by_id(
-        session_id, user_id, validated_input.dict(exclude_none=True)
-    )
+    updated_metadata = update_session_by_id(session_id, user_id, update_fields)
 
     logger.info(
         f"Update session completed for session_id: {session_id} by user: {user_id}"
@@ -507,7 +505,7 @@ def get_session_data(session_id):
         data_path = f"{object_path}/data.mvstory"
 
         logger.info(f"Attempting to read session data from: {data_path}")
-        response = minio_client.get_object(MINIO_BUCKET, data_path)
+        response = client.minio_client.get_object(client.MINIO_BUCKET, data_path)
         raw_bytes = response.read()
         response.close()
 
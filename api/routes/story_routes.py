@@ -12,12 +12,11 @@ from auth import get_user_from_request
 from error_handlers import APIError, error_handler
 from schemas import BaseItemUpdate, StoryInput
 from storage import (
-    MINIO_BUCKET,
     check_user_story_limit,
+    client,
     create_metadata,
     delete_story_by_id,
     list_objects_by_type,
-    minio_client,
     save_object,
     save_story_with_session,
     update_story_by_id,
@@ -127,12 +126,11 @@ def _update_story_json(story_id, user_id):
     logger.info(
         f"Update story (JSON) request received for story_id: {story_id} by user: {user_id}"
     )
-    logger.debug(f"Validated input fields: {validated_input.dict(exclude_none=True)}")
+    update_fields = validated_input.dict(exclude_none=True)
+    logger.debug(f"Validated input fields: {update_fields}")
 
     # Perform the update with authorization check
-    updated_metadata = update_story_by_id(
-        story_id, user_id, validated_input.dict(exclude_none=True)
-    )
+    updated_metadata = update_story_by_id(story_id, user_id, update_fields)
 
     logger.info(
         f"Update story (JSON) completed for story_id: {story_id} by user: {user_id}"
@@ -354,7 +352,7 @@ def _try_read_story_file(object_path, ext, matching_story, story_id):
     data_path = f"{object_path}/data{ext}"
     logger.info(f"Attempting to read story data from: {data_path}")
 
-    response = minio_client.get_object(MINIO_BUCKET, data_path)
+    response = client.minio_client.get_object(client.MINIO_BUCKET, data_path)
     file_bytes = response.read()
     response.close()
 
@@ -648,7 +646,6 @@ def get_story_session_data(story_id):
 
     try:
         story_user_id = matching_story["creator"]["id"]
-        from storage import MINIO_BUCKET, minio_client
         from storage.utils import get_plural_type
 
         path_type = get_plural_type("story")
@@ -657,7 +654,7 @@ def get_story_session_data(story_id):
 
         # Check if session data exists
         try:
-            response = minio_client.get_object(MINIO_BUCKET, session_path)
+            response = client.minio_client.get_object(client.MINIO_BUCKET, session_path)
             session_bytes = response.read()
             response.close()
 
@@ -693,7 +690,6 @@ def get_story_format(story_id):
         raise APIError("Story not found", status_code=404)
     try:
         story_user_id = matching_story["creator"]["id"]
-        from storage import MINIO_BUCKET, minio_client
         from storage.utils import get_plural_type
 
         path_type = get_plural_type("story")
@@ -702,7 +698,7 @@ def get_story_format(story_id):
         for ext in [".mvsj", ".mvsx"]:
             data_path = f"{object_path}/data{ext}"
             try:
-                minio_client.stat_object(MINIO_BUCKET, data_path)
+                client.minio_client.stat_object(client.MINIO_BUCKET, data_path)
                 return jsonify({"format": ext[1:]})  # Remove dot
             except Exception:
                 continue
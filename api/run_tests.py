@@ -46,6 +46,9 @@ def main():
         "pytest",
         "tests/",
         "-v",
+        "-n",
+        "auto",
+        "--dist=loadfile",
         "--cov=.",
         "--cov-report=xml",
         "--cov-report=html",
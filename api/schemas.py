@@ -7,6 +7,7 @@ import zlib
 from typing import Any, Dict, List, Optional, Union
 
 import msgpack
+from jsonschema.validators import validator_for
 from pydantic import BaseModel, Field, validator
 
 # Common creator schema used in both session and story metadata
@@ -67,6 +68,27 @@ story_metadata_schema = {
     },
 }
 
+# Named JSON schemas and their compiled validators, built on first use
+_JSON_SCHEMAS = {
+    "creator": creator_schema,
+    "base_metadata": base_metadata_schema,
+    "session_metadata": session_metadata_schema,
+    "story_metadata": story_metadata_schema,
+}
+_validator_cache = {}
+
+
+def get_validator(name):
+    """Get the cached jsonschema validator for a named schema."""
+    schema_validator = _validator_cache.get(name)
+    if schema_validator is None:
+        schema = _JSON_SCHEMAS[name]
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        schema_validator = _validator_cache[name] = validator_cls(schema)
+    return schema_validator
+
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -481,10 +503,13 @@ def get_allowed_extensions(object_type):
     return extensions
 
 
+# Allowed extensions as tuples so a single str.endswith call checks them all
+_EXTENSION_SUFFIXES = {
+    object_type: tuple(get_allowed_extensions(object_type))
+    for object_type in FILE_FORMATS
+}
+
+
 def validate_file_extension(filename, object_type):
     """Validate that a filename has the correct extension for its object type."""
-    allowed_extensions = get_allowed_extensions(object_type)
-    for ext in allowed_extensions:
-        if filename.endswith(ext):
-            return True
-    return False
+    return filename.endswith(_EXTENSION_SUFFIXES.get(object_type, ()))
@@ -2,17 +2,14 @@
 # This module provides the same API as the original storage.py file
 
 # Import client configuration and basic operations
+from storage import client
 from storage.client import (
-    MINIO_ACCESS_KEY,
-    MINIO_BUCKET,
-    MINIO_ENDPOINT,
-    MINIO_HOST,
-    MINIO_SECRET_KEY,
+    count_minio_objects,
     ensure_bucket_exists,
     handle_minio_error,
+    iter_minio_objects,
     list_minio_buckets,
     list_minio_objects,
-    minio_client,
 )
 
 # Import metadata operations
@@ -26,6 +23,7 @@ from storage.metadata import (
 # Import object CRUD operations
 from storage.objects import (
     delete_all_user_data,
+    delete_many,
     delete_session_by_id,
     delete_story_by_id,
     find_object_by_id,
@@ -53,6 +51,26 @@ from storage.utils import (
     get_object_path,
 )
 
+# Client settings are rebound by storage.client.configure()/reload_config(),
+# so they are looked up on the client module instead of copied at import time
+_CLIENT_ATTRS = frozenset(
+    {
+        "minio_client",
+        "MINIO_ENDPOINT",
+        "MINIO_BUCKET",
+        "MINIO_ACCESS_KEY",
+        "MINIO_SECRET_KEY",
+        "MINIO_HOST",
+    }
+)
+
+
+def __getattr__(name):
+    if name in _CLIENT_ATTRS:
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Export all functions to maintain the same API as the original storage.py
 __all__ = [
     # Client and configuration
@@ -65,6 +83,8 @@ __all__ = [
     "handle_minio_error",
     "ensure_bucket_exists",
     "list_minio_objects",
+    "iter_minio_objects",
+    "count_minio_objects",
     "list_minio_buckets",
     # Metadata operations
     "create_metadata",
@@ -88,6 +108,7 @@ __all__ = [
     "find_object_by_id",
     "list_objects_by_type",
     "delete_all_user_data",
+    "delete_many",
     "delete_session_by_id",
     "delete_story_by_id",
     "update_session_by_id",
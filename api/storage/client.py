@@ -1,7 +1,10 @@
 import logging
 import os
+import threading
 import traceback
 import warnings
+from dataclasses import dataclass, replace
+from typing import Optional
 from urllib.parse import urlparse
 
 import urllib3
@@ -16,39 +19,118 @@ warnings.filterwarnings("ignore", category=urllib3.exceptions.InsecureRequestWar
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# MinIO Configuration
-MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
-MINIO_BUCKET = os.getenv(
-    "MINIO_BUCKET", "root"
-)  # Use environment variable with fallback
-MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
-MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "production")
-MINIO_SECURE = os.getenv("MINIO_SECURE", "true").lower() == "true"
 
-# Check if MinIO is configured
-MINIO_ENABLED = bool(MINIO_ENDPOINT and MINIO_ACCESS_KEY and MINIO_SECRET_KEY)
+# Shared connection pool for every MinIO client this module builds, so
+# configure() swaps credentials without dropping keep-alive connections.
+# Mirrors minio's own defaults apart from the larger pool and fewer retries.
+_HTTP = urllib3.PoolManager(
+    num_pools=16,
+    maxsize=64,
+    timeout=urllib3.Timeout(connect=300, read=300),
+    cert_reqs="CERT_NONE",  # Skip certificate verification for self-signed certs
+    retries=urllib3.Retry(
+        total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+    ),
+)
 
-if not MINIO_ENABLED:
-    logger.warning("MinIO not configured - storage functionality will be disabled")
-    logger.warning(
-        "Set MINIO_ENDPOINT, MINIO_ACCESS_KEY, and MINIO_SECRET_KEY to enable storage"
+
+@dataclass(frozen=True, slots=True)
+class MinioConfig:
+    """MinIO connection settings; replaced as a whole on reconfiguration."""
+
+    endpoint: Optional[str]
+    access_key: Optional[str]
+    secret_key: Optional[str]
+    bucket: str = "root"
+    secure: bool = True
+
+    @classmethod
+    def from_env(cls):
+        """Read the settings from MINIO_* environment variables."""
+        return cls(
+            endpoint=os.getenv("MINIO_ENDPOINT"),
+            access_key=os.getenv("MINIO_ACCESS_KEY"),
+            secret_key=os.getenv("MINIO_SECRET_KEY"),
+            bucket=os.getenv("MINIO_BUCKET", "root"),
+            secure=os.getenv("MINIO_SECURE", "true").lower() == "true",
+        )
+
+    @property
+    def enabled(self):
+        return bool(self.endpoint and self.access_key and self.secret_key)
+
+    @property
+    def host(self):
+        """The endpoint without its scheme, as Minio expects it."""
+        if not self.enabled:
+            return None
+        parsed_url = urlparse(self.endpoint)
+        return parsed_url.netloc if parsed_url.netloc else parsed_url.path
+
+
+_CFG = None
+
+
+def current_config():
+    """Return the MinioConfig the client was built from."""
+    return _CFG
+
+
+def configure(endpoint=None, access_key=None, secret_key=None, bucket=None):
+    """Configure the MinIO client, falling back to environment variables."""
+    env = MinioConfig.from_env()
+    _apply_config(
+        replace(
+            env,
+            endpoint=endpoint or env.endpoint,
+            access_key=access_key or env.access_key,
+            secret_key=secret_key or env.secret_key,
+            bucket=bucket or env.bucket,
+        )
+    )
+
+
+def reload_config():
+    """Re-read MinIO settings from the environment.
+
+    The Minio client is only rebuilt when the connection settings change;
+    a bucket change just swaps the config and re-checks the bucket.
+    """
+    _apply_config(MinioConfig.from_env())
+
+
+def _apply_config(cfg):
+    """Install cfg, rebinding this module's MINIO_* names and minio_client.
+
+    Modules that imported those names directly keep their old bindings.
+    """
+    global _CFG, MINIO_ENDPOINT, MINIO_BUCKET, MINIO_ACCESS_KEY, MINIO_SECRET_KEY
+    global MINIO_SECURE, MINIO_ENABLED, MINIO_HOST, minio_client, _bucket_ready
+
+    previous = _CFG
+    same_connection = previous is not None and (
+        replace(cfg, bucket=previous.bucket) == previous
     )
-    minio_client = None
-else:
-    # Validate required environment variables
-    if not MINIO_ENDPOINT:
-        raise ValueError("MINIO_ENDPOINT environment variable is required")
-    if not MINIO_ACCESS_KEY:
-        raise ValueError("MINIO_ACCESS_KEY environment variable is required")
-    if not MINIO_SECRET_KEY:
-        raise ValueError("MINIO_SECRET_KEY environment variable is required")
-
-# Initialize MinIO client only if enabled
-if MINIO_ENABLED:
-    # Parse the endpoint to get just the host
-    parsed_url = urlparse(MINIO_ENDPOINT)
-    MINIO_HOST = parsed_url.netloc if parsed_url.netloc else parsed_url.path
+
+    _CFG = cfg
+    MINIO_ENDPOINT = cfg.endpoint
+    MINIO_BUCKET = cfg.bucket
+    MINIO_ACCESS_KEY = cfg.access_key
+    MINIO_SECRET_KEY = cfg.secret_key
+    MINIO_SECURE = cfg.secure
+    MINIO_ENABLED = cfg.enabled
+    MINIO_HOST = cfg.host
+    if previous is None or cfg.bucket != previous.bucket:
+        _bucket_ready = False
+
+    if not MINIO_ENABLED:
+        logger.warning("MinIO not configured - storage functionality will be disabled")
+        logger.warning(
+            "Set MINIO_ENDPOINT, MINIO_ACCESS_KEY, and MINIO_SECRET_KEY to enable storage"
+        )
+        minio_client = None
+        return
 
     # Log configuration for debugging
     logger.info("MinIO Configuration:")
@@ -57,18 +139,30 @@ if MINIO_ENABLED:
     logger.info(f"  Host: {MINIO_HOST}")
     logger.info(f"  Bucket: {MINIO_BUCKET}")
 
-    # Initialize MinIO client
+    if same_connection and minio_client is not None:
+        return
+
     # Allow opting out of TLS for local development via MINIO_SECURE=false
     minio_client = Minio(
         MINIO_HOST,
         access_key=MINIO_ACCESS_KEY,
         secret_key=MINIO_SECRET_KEY,
         secure=MINIO_SECURE,
-        cert_check=False,  # Skip certificate verification for self-signed certs
+        http_client=_HTTP,
     )
-else:
-    MINIO_HOST = None
-    minio_client = None
+
+
+minio_client = None
+configure()
+
+
+# S3 error codes that map to something more specific than a generic 500
+_S3_ERRORS = {
+    "NoSuchKey": (404, "Object not found during %s"),
+    "SlowDown": (503, "Storage is busy during %s"),
+    "ServiceUnavailable": (503, "Storage is unavailable during %s"),
+}
+_S3_DEFAULT_ERROR = (500, "Storage operation failed: %s")
 
 
 def handle_minio_error(operation):
@@ -88,11 +182,15 @@ def handle_minio_error(operation):
                 error_msg = f"MinIO error during {operation}: {str(e)}"
                 logger.error(error_msg)
                 logger.error(f"Stack trace: {traceback.format_exc()}")
+                status_code, message = _S3_ERRORS.get(e.code, _S3_DEFAULT_ERROR)
                 raise APIError(
-                    f"Storage operation failed: {operation}",
-                    status_code=500,
+                    message % operation,
+                    status_code=status_code,
                     details={"error": str(e)},
                 )
+            except APIError:
+                # Already mapped by a nested handler; keep its status code
+                raise
             except Exception as e:
                 error_msg = f"Unexpected error during {operation}: {str(e)}"
                 logger.error(error_msg)
@@ -108,54 +206,81 @@ def handle_minio_error(operation):
     return decorator
 
 
+# Set once the bucket has been confirmed, so later calls skip the HEAD request
+_bucket_ready = False
+_bucket_lock = threading.Lock()
+
+
 def ensure_bucket_exists():
-    """Ensure the MinIO bucket exists."""
+    """Ensure the MinIO bucket exists (checked once per process)."""
+    global _bucket_ready
     if not MINIO_ENABLED:
         logger.warning("MinIO not enabled, skipping bucket creation")
         return
-    try:
-        if not minio_client.bucket_exists(MINIO_BUCKET):
-            logger.info(f"Bucket {MINIO_BUCKET} does not exist, creating it")
-            minio_client.make_bucket(MINIO_BUCKET)
-            logger.info(f"Created bucket: {MINIO_BUCKET}")
-    except Exception as e:
-        logger.error(f"Error ensuring bucket exists: {str(e)}")
-        raise
+    if _bucket_ready:
+        return
+    with _bucket_lock:
+        if _bucket_ready:
+            return
+        try:
+            if not minio_client.bucket_exists(MINIO_BUCKET):
+                logger.info(f"Bucket {MINIO_BUCKET} does not exist, creating it")
+                minio_client.make_bucket(MINIO_BUCKET)
+                logger.info(f"Created bucket: {MINIO_BUCKET}")
+        except Exception as e:
+            logger.error(f"Error ensuring bucket exists: {str(e)}")
+            raise
+        _bucket_ready = True
 
 
-@handle_minio_error("list_objects")
-def list_minio_objects(prefix=""):
-    """List objects in the MinIO bucket with optional prefix."""
-    objects = []
-    try:
-        # Ensure the bucket exists
-        ensure_bucket_exists()
+def iter_minio_objects(prefix="", include_user_meta=False):
+    """Yield objects in the MinIO bucket with optional prefix, one at a time.
 
-        logger.info(
-            f"Listing objects in bucket '{MINIO_BUCKET}' with prefix '{prefix}'"
-        )
+    MinIO pages listings 1000 keys at a time, so a caller that stops early
+    never fetches the remaining pages. Errors surface during iteration; use
+    list_minio_objects or count_minio_objects for MinIO error handling.
 
-        # Use recursive=True to get all objects, not just top-level
-        for obj in minio_client.list_objects(
-            MINIO_BUCKET, prefix=prefix, recursive=True
-        ):
-            # Handle potentially missing or None values
-            last_modified = obj.last_modified.isoformat() if obj.last_modified else None
-            etag = obj.etag if hasattr(obj, "etag") else None
-            size = obj.size if hasattr(obj, "size") else 0
-
-            # Only add actual files, not directory markers
-            if not obj.object_name.endswith("/"):
-                objects.append(
-                    {
-                        "key": obj.object_name,
-                        "size": size,
-                        "last_modified": last_modified,
-                        "etag": etag,
-                    }
-                )
+    With ``include_user_meta`` each object also carries its user metadata
+    under ``"metadata"`` (MinIO's ListObjects extension; plain S3 omits it).
+    """
+    # Ensure the bucket exists
+    ensure_bucket_exists()
+
+    logger.info(f"Listing objects in bucket '{MINIO_BUCKET}' with prefix '{prefix}'")
+
+    # Use recursive=True to get all objects, not just top-level
+    for obj in minio_client.list_objects(
+        MINIO_BUCKET,
+        prefix=prefix,
+        recursive=True,
+        include_user_meta=include_user_meta,
+    ):
+        # Only yield actual files, not directory markers
+        if obj.object_name.endswith("/"):
+            continue
+
+        # Handle potentially missing or None values
+        last_modified = obj.last_modified.isoformat() if obj.last_modified else None
+        etag = obj.etag if hasattr(obj, "etag") else None
+        size = obj.size if hasattr(obj, "size") else 0
+
+        logger.debug(f"Found object: {obj.object_name} (size: {size})")
+        item = {
+            "key": obj.object_name,
+            "size": size,
+            "last_modified": last_modified,
+            "etag": etag,
+        }
+        if include_user_meta:
+            item["metadata"] = getattr(obj, "metadata", None) or {}
+        yield item
 
-                logger.debug(f"Found object: {obj.object_name} (size: {size})")
+
+@handle_minio_error("list_objects")
+def list_minio_objects(prefix="", include_user_meta=False):
+    """List objects in the MinIO bucket with optional prefix."""
+    try:
+        objects = list(iter_minio_objects(prefix, include_user_meta))
     except Exception as e:
         logger.error(f"Error listing objects: {e}")
         logger.error(f"Stack trace: {traceback.format_exc()}")
@@ -167,6 +292,22 @@ def list_minio_objects(prefix=""):
     return objects
 
 
+@handle_minio_error("count_objects")
+def count_minio_objects(prefix="", cap=None, suffix=""):
+    """Count objects under a prefix whose key ends with ``suffix``.
+
+    Stops listing once ``cap`` matching objects have been seen.
+    """
+    count = 0
+    for obj in iter_minio_objects(prefix):
+        if not obj["key"].endswith(suffix):
+            continue
+        count += 1
+        if cap is not None and count >= cap:
+            break
+    return count
+
+
 @handle_minio_error("list_buckets")
 def list_minio_buckets():
     """List all buckets in MinIO."""
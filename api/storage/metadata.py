@@ -1,15 +1,10 @@
 import uuid
 from datetime import datetime, timezone
 
-from jsonschema import ValidationError, validate
+from jsonschema.exceptions import best_match
 
 from error_handlers import APIError
-from schemas import (
-    get_allowed_extensions,
-    session_metadata_schema,
-    story_metadata_schema,
-    validate_file_extension,
-)
+from schemas import get_allowed_extensions, get_validator, validate_file_extension
 
 
 def create_metadata(object_type, user_info, title="", description="", tags=None):
@@ -42,37 +37,26 @@ def create_metadata(object_type, user_info, title="", description="", tags=None)
         "version": "1.0",
     }
 
-    try:
-        schema = (
-            session_metadata_schema
-            if object_type == "session"
-            else story_metadata_schema
-        )
-        validate(instance=metadata, schema=schema)
-        return metadata
-    except ValidationError as e:
-        raise APIError(
-            "Invalid metadata format",
-            status_code=400,
-            details={"validation_error": str(e)},
-        )
+    _check_metadata_schema(metadata, object_type)
+    return metadata
 
 
 def validate_metadata(metadata, object_type):
     """Validate metadata against the appropriate schema."""
-    try:
-        schema = (
-            session_metadata_schema
-            if object_type == "session"
-            else story_metadata_schema
-        )
-        validate(instance=metadata, schema=schema)
-        return True
-    except ValidationError as e:
+    _check_metadata_schema(metadata, object_type)
+    return True
+
+
+def _check_metadata_schema(metadata, object_type):
+    """Raise APIError if metadata does not match its type's schema."""
+    schema_name = "session_metadata" if object_type == "session" else "story_metadata"
+    # Same error jsonschema.validate would pick, without re-checking the schema
+    error = best_match(get_validator(schema_name).iter_errors(metadata))
+    if error is not None:
         raise APIError(
             "Invalid metadata format",
             status_code=400,
-            details={"validation_error": str(e)},
+            details={"validation_error": str(error)},
         )
 
 
@@ -3,17 +3,20 @@ import io
 import json
 import logging
 import os
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 import msgpack
+import orjson
+from minio.deleteobjects import DeleteObject
 
 from error_handlers import APIError
+from storage import client
 from storage.client import (
-    MINIO_BUCKET,
     ensure_bucket_exists,
     handle_minio_error,
     list_minio_objects,
-    minio_client,
 )
 from storage.metadata import (
     update_metadata_timestamp,
@@ -31,6 +34,24 @@ from storage.utils import (
 
 logger = logging.getLogger(__name__)
 
+# metadata.json is mirrored into this user-metadata header (base64 of compact
+# JSON) so listings with include_user_meta carry it inline and skip the GET.
+# S3 caps user metadata at 2 KB; larger metadata is only stored in the file.
+INLINE_METADATA_HEADER = "X-Amz-Meta-Mvs-Metadata"
+INLINE_METADATA_MAX_SIZE = 2000
+
+# Parsed metadata.json bodies keyed by (object name, etag)
+METADATA_CACHE_MAX_SIZE = 4096
+_metadata_cache = {}
+_metadata_cache_lock = threading.Lock()
+
+# Shared pool for metadata fetches; the MinIO client is thread-safe and its
+# connection pool holds 64 connections, so 16 workers stay well inside it.
+METADATA_FETCH_WORKERS = 16
+_metadata_executor = ThreadPoolExecutor(
+    max_workers=METADATA_FETCH_WORKERS, thread_name_prefix="metadata-fetch"
+)
+
 
 @handle_minio_error("save_object")
 def save_object(data_type, data, metadata):
@@ -98,20 +119,37 @@ def _validate_save_inputs(data_type, data, metadata):
 def _save_metadata(object_path, metadata):
     """Save metadata to MinIO."""
     metadata_key = f"{object_path}/metadata.json"
-    metadata_bytes = json.dumps(metadata, indent=2).encode("utf-8")
+    metadata_bytes = orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
 
     with io.BytesIO(metadata_bytes) as metadata_stream:
         logger.info(f"Saving metadata to {metadata_key}")
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET,
+        client.minio_client.put_object(
+            bucket_name=client.MINIO_BUCKET,
             object_name=metadata_key,
             data=metadata_stream,
             length=len(metadata_bytes),
             content_type="application/json",
+            metadata=_inline_metadata_headers(metadata),
         )
         logger.info("Successfully saved metadata")
 
 
+def _inline_metadata_headers(metadata):
+    """Build the user-metadata header mirroring metadata, if it fits."""
+    encoded = base64.b64encode(orjson.dumps(metadata)).decode("ascii")
+    if len(encoded) > INLINE_METADATA_MAX_SIZE:
+        return None
+    return {INLINE_METADATA_HEADER: encoded}
+
+
+def _inline_metadata(obj):
+    """Return the inline metadata header value from a listed object, if any."""
+    for name, value in obj.get("metadata", {}).items():
+        if name.lower() == INLINE_METADATA_HEADER.lower():
+            return value
+    return None
+
+
 def _save_data(object_path, data, data_type):
     """Save data to MinIO."""
     filename = data.get("filename")
@@ -173,8 +211,8 @@ def _save_data(object_path, data, data_type):
 
     with io.BytesIO(data_bytes) as data_stream:
         logger.info(f"Saving data to {data_key}")
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET,
+        client.minio_client.put_object(
+            bucket_name=client.MINIO_BUCKET,
             object_name=data_key,
             data=data_stream,
             length=len(data_bytes),
@@ -195,8 +233,8 @@ def _save_session_data(object_path, session_data):
 
     with io.BytesIO(session_data) as session_stream:
         logger.info(f"Saving session data to {session_key}")
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET,
+        client.minio_client.put_object(
+            bucket_name=client.MINIO_BUCKET,
             object_name=session_key,
             data=session_stream,
             length=len(session_data),
@@ -222,7 +260,7 @@ def _list_objects_for_user(data_type, path_type, user_id):
 
     logger.info(f"Listing objects for user {user_id} with prefix: {prefix}")
 
-    objects = list_minio_objects(prefix)
+    objects = list_minio_objects(prefix, include_user_meta=True)
     if objects is None:
         logger.info(f"No objects found for prefix: {prefix}")
         return []
@@ -245,7 +283,7 @@ def _list_objects_for_all_users(data_type, path_type):
     for uid in user_ids:
         user_prefix = f"{uid}/{path_type}/"
 
-        user_objects = list_minio_objects(user_prefix)
+        user_objects = list_minio_objects(user_prefix, include_user_meta=True)
         if user_objects:
             user_result = _process_objects_for_user(user_objects, data_type, uid)
             result.extend(user_result)
@@ -266,22 +304,71 @@ def _process_objects_for_user(objects, data_type, user_id):
         f"Found {len(object_dirs)} potential {data_type} directories for user {user_id}"
     )
 
-    for dir_path in object_dirs:
-        metadata = _load_metadata_from_directory(dir_path, data_type)
+    listed = {obj["key"]: obj for obj in objects}
+
+    # Directories without inline metadata cost a GET each; run them concurrently
+    loaded = _metadata_executor.map(
+        lambda dir_path: _load_metadata_from_directory(
+            dir_path, data_type, listed.get(f"{dir_path}metadata.json")
+        ),
+        object_dirs,
+    )
+    for metadata in loaded:
         if metadata:
             result.append(metadata)
 
     return result
 
 
-def _load_metadata_from_directory(dir_path, data_type):
-    """Load and validate metadata from a directory."""
+def _get_metadata(metadata_path, etag):
+    """Fetch and parse a metadata.json, reusing the parse while its etag holds.
+
+    A rewrite changes the etag, so stale entries are simply never hit again.
+    Callers get a shallow copy since routes add fields to listed metadata.
+    """
+    key = (metadata_path, etag)
+    with _metadata_cache_lock:
+        metadata = _metadata_cache.get(key)
+
+    if metadata is None:
+        logger.debug(f"Looking for metadata at: {metadata_path}")
+        response = client.minio_client.get_object(client.MINIO_BUCKET, metadata_path)
+        try:
+            metadata = orjson.loads(response.read())
+        finally:
+            response.close()
+
+        if etag:
+            with _metadata_cache_lock:
+                if len(_metadata_cache) >= METADATA_CACHE_MAX_SIZE:
+                    # Evict the oldest entry; dicts keep insertion order
+                    del _metadata_cache[next(iter(_metadata_cache))]
+                _metadata_cache[key] = metadata
+
+    return dict(metadata)
+
+
+def clear_metadata_cache():
+    """Drop all cached metadata.json parses."""
+    with _metadata_cache_lock:
+        _metadata_cache.clear()
+
+
+def _load_metadata_from_directory(dir_path, data_type, listed=None):
+    """Load and validate metadata from a directory.
+
+    ``listed`` is the directory's metadata.json entry from the listing. Its
+    inline metadata header is used when present; objects saved before the
+    header existed (or with oversized metadata) fall back to a cached GET.
+    """
     metadata_path = f"{dir_path}metadata.json"
+    listed = listed or {}
     try:
-        logger.debug(f"Looking for metadata at: {metadata_path}")
-        response = minio_client.get_object(MINIO_BUCKET, metadata_path)
-        data = response.read()
-        metadata = json.loads(data.decode("utf-8"))
+        inline = _inline_metadata(listed)
+        if inline:
+            metadata = orjson.loads(base64.b64decode(inline))
+        else:
+            metadata = _get_metadata(metadata_path, listed.get("etag"))
 
         # Validate that this is the correct type of object
         actual_type = metadata.get("type")
@@ -297,9 +384,6 @@ def _load_metadata_from_directory(dir_path, data_type):
         logger.error(f"Invalid JSON in metadata file {metadata_path}: {e}")
     except Exception as e:
         logger.error(f"Error reading metadata for {metadata_path}: {e}")
-    finally:
-        if "response" in locals():
-            response.close()
 
     return None
 
@@ -339,23 +423,29 @@ def delete_all_user_data(user_id):
     )
 
 
-def _delete_objects(objects):
-    """Delete a list of objects and return successfully deleted objects."""
-    deleted_objects = []
+def delete_many(keys):
+    """Delete objects with batched DeleteObjects requests.
 
-    for obj in objects:
-        try:
-            object_key = obj["key"]
-            logger.debug(f"Deleting object: {object_key}")
+    MinIO sends up to 1000 keys per request. Returns the keys that were
+    deleted; per-key failures are logged and left out.
+    """
+    keys = list(keys)
+    failed = set()
+
+    # remove_objects is lazy: the requests go out as its errors are consumed
+    errors = client.minio_client.remove_objects(
+        client.MINIO_BUCKET, (DeleteObject(key) for key in keys)
+    )
+    for error in errors:
+        logger.error(f"Failed to delete object {error.name}: {error.message}")
+        failed.add(error.name)
 
-            minio_client.remove_object(MINIO_BUCKET, object_key)
-            deleted_objects.append(object_key)
+    return [key for key in keys if key not in failed]
 
-        except Exception as e:
-            logger.error(f"Failed to delete object {obj['key']}: {str(e)}")
-            continue
 
-    return deleted_objects
+def _delete_objects(objects):
+    """Delete a list of objects and return successfully deleted objects."""
+    return delete_many(obj["key"] for obj in objects)
 
 
 def _count_deleted_objects(deleted_objects):
@@ -470,26 +560,23 @@ def _delete_object_files(obj, object_id, object_type):
     path_type = get_plural_type(object_type)
     object_path = f"{creator_id}/{path_type}/{object_id}"
 
-    # Delete metadata.json
     metadata_key = f"{object_path}/metadata.json"
-    logger.debug(f"Deleting metadata: {metadata_key}")
-    minio_client.remove_object(MINIO_BUCKET, metadata_key)
-
-    deleted_files = [metadata_key]
 
     if object_type == "session":
-        # Delete data.mvstory
-        data_key = f"{object_path}/data.mvstory"
-        logger.debug(f"Deleting data: {data_key}")
-        minio_client.remove_object(MINIO_BUCKET, data_key)
-        deleted_files.append(data_key)
+        data_files = [f"{object_path}/data.mvstory"]
     else:
-        # For stories, find and delete the data file (could be .mvsj or .mvsx)
+        # For stories, find the data file (could be .mvsj or .mvsx)
         data_files = _find_story_data_files(object_path)
-        for data_file in data_files:
-            logger.debug(f"Deleting data file: {data_file}")
-            minio_client.remove_object(MINIO_BUCKET, data_file)
-            deleted_files.append(data_file)
+
+    keys = [metadata_key, *data_files]
+    logger.debug(f"Deleting files: {keys}")
+    deleted_files = delete_many(keys)
+    if len(deleted_files) != len(keys):
+        raise APIError(
+            f"Failed to delete all files for {object_type} {object_id}",
+            status_code=500,
+            details={"deleted_files": deleted_files},
+        )
 
     return deleted_files
 
@@ -627,8 +714,8 @@ def _save_updated_session_data(object_path, metadata, update_data, session_id):
         data_bytes = msgpack.packb(storage_data, use_bin_type=True)
 
     with io.BytesIO(data_bytes) as data_stream:
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET,
+        client.minio_client.put_object(
+            bucket_name=client.MINIO_BUCKET,
             object_name=data_key,
             data=data_stream,
             length=len(data_bytes),
@@ -659,8 +746,8 @@ def _save_updated_story_data(object_path, metadata, update_data, story_id):
     data_bytes = json.dumps(story_data, indent=2).encode("utf-8")
 
     with io.BytesIO(data_bytes) as data_stream:
-        minio_client.put_object(
-            bucket_name=MINIO_BUCKET,
+        client.minio_client.put_object(
+            bucket_name=client.MINIO_BUCKET,
             object_name=data_key,
             data=data_stream,
             length=len(data_bytes),
@@ -2,29 +2,27 @@ import logging
 import traceback
 
 from error_handlers import APIError
-from storage.client import handle_minio_error
+from storage.client import count_minio_objects, handle_minio_error
 
 logger = logging.getLogger(__name__)
 
 
 @handle_minio_error("count_user_objects")
-def count_user_sessions(user_id):
+def count_user_sessions(user_id, cap=None):
     """Count the number of sessions owned by a specific user.
 
     Args:
         user_id (str): The user ID to count sessions for
+        cap (int, optional): Stop counting once this many sessions are found
 
     Returns:
-        int: Number of sessions owned by the user
+        int: Number of sessions owned by the user (at most ``cap``)
     """
     try:
-        # Import here to avoid circular import
-        from storage.objects import list_objects_by_type
-
-        # Count all sessions for this user (they're all private now)
-        sessions = list_objects_by_type("session", user_id=user_id)
-
-        total_count = len(sessions)
+        # One metadata.json per session directory; no per-session metadata reads
+        total_count = count_minio_objects(
+            f"{user_id}/sessions/", cap=cap, suffix="/metadata.json"
+        )
         logger.info(f"User {user_id} has {total_count} sessions")
         return total_count
 
@@ -36,23 +34,21 @@ def count_user_sessions(user_id):
 
 
 @handle_minio_error("count_user_objects")
-def count_user_stories(user_id):
+def count_user_stories(user_id, cap=None):
     """Count the number of stories owned by a specific user.
 
     Args:
         user_id (str): The user ID to count stories for
+        cap (int, optional): Stop counting once this many stories are found
 
     Returns:
-        int: Number of stories owned by the user
+        int: Number of stories owned by the user (at most ``cap``)
     """
     try:
-        # Import here to avoid circular import
-        from storage.objects import list_objects_by_type
-
-        # Count all stories for this user (they're all public now)
-        stories = list_objects_by_type("story", user_id=user_id)
-
-        total_count = len(stories)
+        # One metadata.json per story directory; no per-story metadata reads
+        total_count = count_minio_objects(
+            f"{user_id}/stories/", cap=cap, suffix="/metadata.json"
+        )
         logger.info(f"User {user_id} has {total_count} stories")
         return total_count
 
@@ -76,7 +72,8 @@ def check_user_session_limit(user_id, max_sessions):
     Raises:
         APIError: If the user has reached the session limit
     """
-    current_count = count_user_sessions(user_id)
+    # Counting one past the limit is enough to decide
+    current_count = count_user_sessions(user_id, cap=max_sessions + 1)
 
     if current_count >= max_sessions:
         raise APIError(
@@ -109,7 +106,8 @@ def check_user_story_limit(user_id, max_stories):
     Raises:
         APIError: If the user has reached the story limit
     """
-    current_count = count_user_stories(user_id)
+    # Counting one past the limit is enough to decide
+    current_count = count_user_stories(user_id, cap=max_stories + 1)
 
     if current_count >= max_stories:
         raise APIError(
@@ -1,15 +1,23 @@
 import os
+from types import MappingProxyType
+
+_PLURAL_TYPES = {"story": "stories", "session": "sessions"}
+
+_STORY_EXTENSIONS = frozenset((".mvsj", ".mvsx"))
+
+# Sessions are deflated msgpack, so anything that is not a story gets
+# the more specific content type
+_CONTENT_TYPES = MappingProxyType({"story": "application/json"})
+_DEFAULT_CONTENT_TYPE = "application/x-deflate"
 
 
 def get_plural_type(data_type):
     """Convert data type to proper plural form."""
-    if data_type == "story":
-        return "stories"
-    elif data_type == "session":
-        return "sessions"
-    else:
+    plural = _PLURAL_TYPES.get(data_type)
+    if plural is None:
         # Fallback for any other types
         return data_type + "s"
+    return plural
 
 
 def get_object_path(metadata, data_type):
@@ -39,7 +47,7 @@ def get_data_file_extension(data_type, filename=None):
         # For stories: use the original extension from the filename
         if filename:
             _, ext = os.path.splitext(filename)
-            return ext if ext in [".mvsj", ".mvsx"] else ".mvsj"
+            return ext if ext in _STORY_EXTENSIONS else ".mvsj"
         return ".mvsj"
     else:
         # For sessions: use msgpack format
@@ -48,11 +56,7 @@ def get_data_file_extension(data_type, filename=None):
 
 def get_content_type(data_type):
     """Get the appropriate content type for data files."""
-    if data_type == "story":
-        return "application/json"
-    else:
-        # Sessions are deflated msgpack - use a more specific content type
-        return "application/x-deflate"
+    return _CONTENT_TYPES.get(data_type, _DEFAULT_CONTENT_TYPE)
 
 
 def extract_unique_object_directories(objects, path_type):
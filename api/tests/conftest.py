@@ -1,50 +1,184 @@
 """Pytest configuration and fixtures."""
 
+import base64
+import io
+import json
 import os
-import tempfile
+from contextlib import ExitStack
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import Mock, patch
 
+import msgpack
 import pytest
+import requests
+from flask import Flask
+from flask.sessions import SecureCookieSession
+from werkzeug.test import EnvironBuilder
 
+import auth
 from app import app as flask_app
+from config import configure_app
+
+_TEST_ENV = {
+    "OIDC_USERINFO_URL": "http://test-oidc/userinfo",
+    "BASE_URL": "http://test-base-url",
+    "MAX_SESSIONS_PER_USER": "10",
+    "MAX_STORIES_PER_USER": "10",
+    "MAX_UPLOAD_SIZE_MB": "50",
+    "MINIO_ENDPOINT": "test-minio:9000",
+    "MINIO_ACCESS_KEY": "test-access-key",
+    "MINIO_SECRET_KEY": "test-secret-key",
+    "MINIO_BUCKET_NAME": "test-bucket",
+}
+
+
+@pytest.fixture(scope="session")
+def _app():
+    """The Flask app, switched into testing mode once per session.
+
+    The Flask app is a module-level singleton that is fully configured at
+    import time, so it is set up once per test session rather than per test.
+    """
+    flask_app.config["TESTING"] = True
+    flask_app.config["WTF_CSRF_ENABLED"] = False
+    return flask_app
 
 
 @pytest.fixture
-def app():
-    """Create and configure a test Flask application."""
-    # Set test environment variables
-    test_env = {
-        "OIDC_USERINFO_URL": "http://test-oidc/userinfo",
-        "BASE_URL": "http://test-base-url",
-        "MAX_SESSIONS_PER_USER": "10",
-        "MAX_STORIES_PER_USER": "10",
-        "MAX_UPLOAD_SIZE_MB": "50",
-        "MINIO_ENDPOINT": "test-minio:9000",
-        "MINIO_ACCESS_KEY": "test-access-key",
-        "MINIO_SECRET_KEY": "test-secret-key",
-        "MINIO_BUCKET_NAME": "test-bucket",
-    }
+def app(_app):
+    """The test app, with the test environment and an app context per test."""
+    with patch.dict(os.environ, _TEST_ENV), _app.app_context():
+        yield _app
+
+
+_OIDC_USERINFO = {
+    "sub": "test-user-123",
+    "name": "Test User",
+    "email": "test@example.com",
+    "preferred_username": "testuser",
+}
+
+
+def _oidc_userinfo_get(url, headers=None, **kwargs):
+    """Answer userinfo calls: ``Bearer test-token`` is valid, anything else 401s."""
+    response = requests.Response()
+    response.url = url
+    if (headers or {}).get("Authorization") == "Bearer test-token":
+        response.status_code = 200
+        response._content = json.dumps(_OIDC_USERINFO).encode()
+    else:
+        response.status_code = 401
+        response._content = b'{"error": "invalid_token"}'
+    return response
+
+
+@pytest.fixture(scope="session", autouse=True)
+def oidc_mock():
+    """Keep the shared OIDC session off the network for the whole run."""
+    with patch.object(auth._SESSION, "get", _oidc_userinfo_get):
+        yield
+
+
+@pytest.fixture(scope="session")
+def _shared_client(_app):
+    """A single test client reused by every test through ``client``."""
+    return _app.test_client()
+
+
+@pytest.fixture
+def client(app, _shared_client):
+    """Return the test client shared by the whole session.
+
+    Tests only issue stateless requests through it; use ``isolated_client``
+    for anything that relies on the session cookie.
+    """
+    return _shared_client
+
+
+@pytest.fixture
+def isolated_client(app):
+    """Create a fresh test client whose cookies do not leak between tests."""
+    with app.test_client() as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def _environ_cache():
+    """Built WSGI environs shared by ``request_ctx`` across the session."""
+    return {}
+
+
+@pytest.fixture
+def request_ctx(app, _environ_cache):
+    """Return a factory for request contexts built from memoized environs.
 
-    with patch.dict(os.environ, test_env):
-        # Create test app
-        test_app = flask_app
-        test_app.config["TESTING"] = True
-        test_app.config["WTF_CSRF_ENABLED"] = False
+    Identical ``(path, method, headers, environ_overrides)`` combinations reuse
+    one EnvironBuilder result; each context gets its own copy and input stream.
+    """
 
-        # Create a temporary database for testing
-        db_fd, test_app.config["DATABASE"] = tempfile.mkstemp()
+    def _make(path="/api/test", method="GET", headers=None, environ_overrides=None):
+        key = (
+            path,
+            method,
+            tuple(sorted((headers or {}).items())),
+            tuple(sorted((environ_overrides or {}).items())),
+        )
+        environ = _environ_cache.get(key)
+        if environ is None:
+            builder = EnvironBuilder(
+                path=path,
+                method=method,
+                headers=headers,
+                environ_overrides=environ_overrides,
+            )
+            try:
+                environ = builder.get_environ()
+            finally:
+                builder.close()
+            _environ_cache[key] = environ
+        return app.request_context(dict(environ, **{"wsgi.input": io.BytesIO()}))
 
-        with test_app.app_context():
-            yield test_app
+    return _make
 
-        os.close(db_fd)
-        os.unlink(test_app.config["DATABASE"])
+
+@pytest.fixture
+def session_ctx(app):
+    """Return a factory that pushes a request context with a preset session.
+
+    The session is injected on the context directly, so tests of
+    session-protected views need no test client or cookie round-trip.
+    """
+    pushed = []
+
+    def _make(user=None):
+        ctx = app.test_request_context()
+        ctx.session = SecureCookieSession({"user": user} if user else {})
+        ctx.push()
+        pushed.append(ctx)
+        return ctx
+
+    yield _make
+
+    while pushed:
+        pushed.pop().pop()
 
 
 @pytest.fixture
-def client(app):
-    """Create a test client for the Flask application."""
-    return app.test_client()
+def configured_app(request):
+    """Build a fresh app through ``configure_app`` under ``request.param`` env.
+
+    Use with ``indirect=True``. CORS and the size middleware are patched out,
+    so only the config values themselves are computed.
+    """
+    env = getattr(request, "param", {})
+    with (
+        patch.dict(os.environ, env, clear=True),
+        patch("config.configure_cors"),
+        patch("utils.SizeValidationMiddleware"),
+    ):
+        test_app = Flask(request.node.name)
+        configure_app(test_app)
+        yield test_app
 
 
 @pytest.fixture
@@ -53,47 +187,103 @@ def runner(app):
     return app.test_cli_runner()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_userinfo():
-    """Mock user info response."""
-    return {
-        "sub": "test-user-123",
-        "name": "Test User",
-        "email": "test@example.com",
-        "preferred_username": "testuser",
-    }
+    """Mock user info response (read-only, shared across the session)."""
+    return MappingProxyType(
+        {
+            "sub": "test-user-123",
+            "name": "Test User",
+            "email": "test@example.com",
+            "preferred_username": "testuser",
+        }
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_session_user():
-    """Mock session user."""
+    """Mock session user (read-only, shared across the session)."""
+    return MappingProxyType(
+        {
+            "sub": "test-user-123",
+            "name": "Test User",
+            "email": "test@example.com",
+            "preferred_username": "testuser",
+        }
+    )
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    """Authentication headers for API requests (read-only, shared across the session)."""
+    return MappingProxyType({"Authorization": "Bearer test-token"})
+
+
+def _minio_canned():
+    """Canned MinIO return values, with fresh child mocks on every call."""
     return {
-        "sub": "test-user-123",
-        "name": "Test User",
-        "email": "test@example.com",
-        "preferred_username": "testuser",
+        "bucket_exists.return_value": True,
+        "make_bucket.return_value": None,
+        "put_object.return_value": Mock(),
+        "get_object.return_value": Mock(),
+        "list_objects.return_value": [],
+        "remove_object.return_value": None,
+        "remove_objects.return_value": [],
     }
 
 
+@pytest.fixture(scope="session")
+def minio_stub():
+    """MinIO client stub, built once per session."""
+    return Mock(**_minio_canned())
+
+
 @pytest.fixture
-def auth_headers():
-    """Authentication headers for API requests."""
-    return {"Authorization": "Bearer test-token"}
+def mock_minio(minio_stub):
+    """Mock MinIO client, restored to fresh canned return values for each test."""
+    minio_stub.reset_mock(return_value=True, side_effect=True)
+    minio_stub.configure_mock(**_minio_canned())
+    with patch("storage.client.minio_client", minio_stub):
+        yield minio_stub
+
+
+_SESSION_ROUTE_TARGETS = (
+    "get_user_from_request",
+    "check_user_session_limit",
+    "create_metadata",
+    "save_object",
+    "find_object_by_id",
+    "update_session_by_id",
+    "count_user_sessions",
+    "count_user_stories",
+)
 
 
 @pytest.fixture
-def mock_minio():
-    """Mock MinIO client."""
-    mock_client = Mock()
-    mock_client.bucket_exists.return_value = True
-    mock_client.make_bucket.return_value = None
-    mock_client.put_object.return_value = Mock()
-    mock_client.get_object.return_value = Mock()
-    mock_client.list_objects.return_value = []
-    mock_client.remove_object.return_value = None
-
-    with patch("storage.client.minio_client", mock_client):
-        yield mock_client
+def session_route_mocks():
+    """Patch the session routes' auth/storage dependencies for one test.
+
+    The patches are authenticated as ``user-123`` and stopped when the test
+    ends, so other tests hit the real auth and storage code.
+    """
+    with ExitStack() as stack:
+        mocks = SimpleNamespace(
+            **{
+                name: stack.enter_context(patch(f"routes.session_routes.{name}"))
+                for name in _SESSION_ROUTE_TARGETS
+            }
+        )
+        mocks.get_user_from_request.return_value = (
+            {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
+            "user-123",
+        )
+        yield mocks
+
+
+@pytest.fixture(scope="session")
+def b64_msgpack_minimal():
+    """Base64-encoded msgpack of a minimal session payload, built once."""
+    return base64.b64encode(msgpack.packb({"k": 1})).decode("utf-8")
 
 
 @pytest.fixture
@@ -7,25 +7,55 @@ them fast, deterministic and CI-friendly (no external MinIO or OIDC calls).
 import base64
 import io
 import json
-from unittest.mock import Mock, patch
+import zlib
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import msgpack
+import pytest
 
 
 def _b64_msgpack(obj):
     return base64.b64encode(msgpack.packb(obj)).decode("utf-8")
 
 
-@patch("routes.session_routes.save_object")
-@patch("routes.session_routes.create_metadata")
-@patch("routes.session_routes.check_user_session_limit")
-@patch("routes.session_routes.get_user_from_request")
-def test_create_session_success(mock_auth, mock_limit, mock_md, mock_save, client):
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "T", "email": "e"},
-        "user-123",
-    )
-    mock_limit.return_value = True
+# Legacy JSON request bodies, serialized once at import
+_JSON = "application/json"
+_LEGACY_RETURN_DATA_STORY_JSON = json.dumps(
+    {
+        "filename": "s.mvsj",
+        "title": "t",
+        "description": "d",
+        "tags": ["a"],
+        "data": {"data": {"x": 1}},
+    }
+).encode()
+_LEGACY_STORY_JSON = json.dumps(
+    {
+        "filename": "legacy.mvsj",
+        "title": "Legacy Story",
+        "description": "Created with JSON API",
+        "tags": [],
+        "data": {"scenes": [{"id": 1}]},
+    }
+).encode()
+_LEGACY_SESSION_JSON = json.dumps(
+    {
+        "filename": "legacy.mvstory",
+        "title": "Legacy Session",
+        "description": "Testing legacy JSON",
+        "data": _b64_msgpack({"version": 1, "story": {"scenes": []}}),
+        "tags": [],
+    }
+).encode()
+
+
+def _minio_response(body):
+    return SimpleNamespace(read=lambda: body, close=lambda: None)
+
+
+def test_create_session_success(session_route_mocks, client):
+    mock_md = session_route_mocks.create_metadata
     mock_md.return_value = {
         "id": "sess-1",
         "type": "session",
@@ -37,7 +67,7 @@ def test_create_session_success(mock_auth, mock_limit, mock_md, mock_save, clien
         "created_at": "2024-01-01T00:00:00Z",
         "updated_at": "2024-01-01T00:00:00Z",
     }
-    mock_save.return_value = mock_md.return_value
+    session_route_mocks.save_object.return_value = mock_md.return_value
 
     # Use FormData format (new standard)
     test_data = msgpack.packb({"k": 1})
@@ -56,14 +86,8 @@ def test_create_session_success(mock_auth, mock_limit, mock_md, mock_save, clien
     assert body["creator"]["id"] == "user-123"
 
 
-@patch("routes.session_routes.find_object_by_id")
-@patch("routes.session_routes.get_user_from_request")
-def test_get_session_authenticated_owner(mock_auth, mock_find, client):
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "T", "email": "e"},
-        "user-123",
-    )
-    mock_find.return_value = {
+def test_get_session_authenticated_owner(session_route_mocks, client):
+    session_route_mocks.find_object_by_id.return_value = {
         "id": "sess-1",
         "type": "session",
         "creator": {"id": "user-123"},
@@ -74,22 +98,6 @@ def test_get_session_authenticated_owner(mock_auth, mock_find, client):
     assert resp.get_json()["id"] == "sess-1"
 
 
-def test_create_story_legacy_return_data_no_longer_supported(client):
-    """Test that the ?return_data parameter with JSON is no longer supported"""
-    payload = {
-        "filename": "s.mvsj",
-        "title": "t",
-        "description": "d",
-        "tags": ["a"],
-        "data": {"data": {"x": 1}},
-    }
-    resp = client.post("/api/story?return_data=true", json=payload)
-    assert resp.status_code == 400
-    body = resp.get_json()
-    assert "Legacy JSON format is no longer supported" in body["message"]
-
-
-@patch("routes.story_routes.minio_client")
 @patch("routes.story_routes.list_objects_by_type")
 def test_get_story_data_mvsj(mock_list, mock_minio, client):
     # Story exists and belongs to user-123
@@ -98,28 +106,37 @@ def test_get_story_data_mvsj(mock_list, mock_minio, client):
     ]
 
     # Mock MinIO get_object to return MVSJ JSON with a top-level "data" key
-    mock_resp = Mock()
-    mock_resp.read.return_value = b'{"data": {"hello": "world"}}'
-    mock_minio.get_object.return_value = mock_resp
+    mock_minio.get_object.return_value = _minio_response(
+        b'{"data": {"hello": "world"}}'
+    )
 
     resp = client.get("/api/story/story-1/data?format=mvsj")
     assert resp.status_code == 200
     assert resp.get_json() == {"hello": "world"}
 
 
+@patch("routes.story_routes.list_objects_by_type")
+def test_get_story_data_mvsj_big_integer(mock_list, mock_minio, client):
+    # Integers wider than 64 bits are valid JSON and must survive the round trip
+    mock_list.return_value = [
+        {"id": "story-1", "creator": {"id": "user-123"}, "filename": "s.mvsj"}
+    ]
+    mock_minio.get_object.return_value = _minio_response(
+        json.dumps({"data": {"big": 2**70}}).encode("utf-8")
+    )
+
+    resp = client.get("/api/story/story-1/data?format=mvsj")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"big": 2**70}
+
+
 @patch("routes.story_routes.save_story_with_session")
 @patch("routes.story_routes.create_metadata")
 @patch("routes.story_routes.check_user_story_limit")
-@patch("routes.story_routes.get_user_from_request")
 def test_create_story_formdata_mvsj_with_session(
-    mock_auth, mock_limit, mock_md, mock_save, client
+    mock_limit, mock_md, mock_save, client, auth_headers
 ):
     """Test creating a story with FormData (.mvsj + session files) using new field structure"""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "T", "email": "e"},
-        "user-123",
-    )
-    mock_limit.return_value = True
     mock_md.return_value = {
         "id": "story-1",
         "type": "story",
@@ -149,7 +166,7 @@ def test_create_story_formdata_mvsj_with_session(
         "session": (session_blob, "session.mvstory"),
     }
 
-    resp = client.post("/api/story", data=form_data)
+    resp = client.post("/api/story", data=form_data, headers=auth_headers)
     assert resp.status_code == 201
 
     body = resp.get_json()
@@ -161,16 +178,10 @@ def test_create_story_formdata_mvsj_with_session(
 @patch("routes.story_routes.save_story_with_session")
 @patch("routes.story_routes.create_metadata")
 @patch("routes.story_routes.check_user_story_limit")
-@patch("routes.story_routes.get_user_from_request")
 def test_create_story_formdata_mvsx_with_session(
-    mock_auth, mock_limit, mock_md, mock_save, client
+    mock_limit, mock_md, mock_save, client, auth_headers
 ):
     """Test creating a story with FormData (.mvsx + session files) using new field structure"""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "T", "email": "e"},
-        "user-123",
-    )
-    mock_limit.return_value = True
     mock_md.return_value = {
         "id": "story-2",
         "type": "story",
@@ -195,7 +206,7 @@ def test_create_story_formdata_mvsx_with_session(
         "session": (session_blob, "session.mvstory"),
     }
 
-    resp = client.post("/api/story", data=form_data)
+    resp = client.post("/api/story", data=form_data, headers=auth_headers)
     assert resp.status_code == 201
 
     body = resp.get_json()
@@ -203,51 +214,62 @@ def test_create_story_formdata_mvsx_with_session(
     assert "public_uri" in body
 
 
-def test_create_story_json_no_longer_supported(client):
-    """Test that legacy JSON story creation is no longer supported"""
-    payload = {
-        "filename": "legacy.mvsj",
-        "title": "Legacy Story",
-        "description": "Created with JSON API",
-        "tags": [],
-        "data": {"scenes": [{"id": 1}]},
-    }
-
-    resp = client.post("/api/story", json=payload)
-    assert resp.status_code == 400
-    body = resp.get_json()
-    assert "Legacy JSON format is no longer supported" in body["message"]
-
-
-def test_create_story_formdata_missing_story_file(client):
-    """Test FormData creation fails when story file is missing (no mvsx or mvsj)"""
-    form_data = {
-        "title": "Incomplete Story",
-        "description": "Missing story file",
-        "tags": "[]",
-        "session": (io.BytesIO(b"session_data"), "session.mvstory"),
-    }
-
-    resp = client.post("/api/story", data=form_data)
-    assert resp.status_code == 400
-    body = resp.get_json()
-    assert "Story file is required" in body["message"]
-
-
-def test_create_story_formdata_missing_session_file(client):
-    """Test FormData creation fails when session file is missing"""
-    story_blob = io.BytesIO(b'{"scenes": []}')
-    form_data = {
-        "title": "Incomplete Story",
-        "description": "Missing session file",
-        "tags": "[]",
-        "mvsj": (story_blob, "story.mvsj"),
-    }
-
-    resp = client.post("/api/story", data=form_data)
+@pytest.mark.parametrize(
+    "url, request_kwargs, expected_message",
+    [
+        pytest.param(
+            "/api/story?return_data=true",
+            {"data": _LEGACY_RETURN_DATA_STORY_JSON, "content_type": _JSON},
+            "Legacy JSON format is no longer supported",
+            id="legacy-return-data",
+        ),
+        pytest.param(
+            "/api/story",
+            {"data": _LEGACY_STORY_JSON, "content_type": _JSON},
+            "Legacy JSON format is no longer supported",
+            id="legacy-json",
+        ),
+        pytest.param(
+            "/api/story",
+            {
+                "data": {
+                    "title": "Incomplete Story",
+                    "description": "Missing story file",
+                    "tags": "[]",
+                    "session": (b"session_data", "session.mvstory"),
+                }
+            },
+            "Story file is required",
+            id="missing-story-file",
+        ),
+        pytest.param(
+            "/api/story",
+            {
+                "data": {
+                    "title": "Incomplete Story",
+                    "description": "Missing session file",
+                    "tags": "[]",
+                    "mvsj": (b'{"scenes": []}', "story.mvsj"),
+                }
+            },
+            "Session file is required",
+            id="missing-session-file",
+        ),
+    ],
+)
+def test_create_story_rejected(client, url, request_kwargs, expected_message):
+    """Story creation without the FormData story + session files is a 400."""
+    if isinstance(request_kwargs["data"], dict):
+        # Fresh streams per run; file fields are declared as (bytes, filename)
+        request_kwargs = {
+            "data": {
+                k: (io.BytesIO(v[0]), v[1]) if isinstance(v, tuple) else v
+                for k, v in request_kwargs["data"].items()
+            }
+        }
+    resp = client.post(url, **request_kwargs)
     assert resp.status_code == 400
-    body = resp.get_json()
-    assert "Session file is required" in body["message"]
+    assert expected_message.encode() in resp.data
 
 
 @patch("routes.story_routes._get_story_by_id")
@@ -266,16 +288,9 @@ def test_get_story_session_data_endpoint_exists(mock_get_story, client):
     assert "not found" in body["message"].lower()
 
 
-@patch("routes.session_routes.count_user_sessions")
-@patch("routes.session_routes.count_user_stories")
-@patch("routes.session_routes.get_user_from_request")
-def test_get_user_quota(mock_auth, mock_count_stories, mock_count_sessions, client):
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "T", "email": "e"},
-        "user-123",
-    )
-    mock_count_sessions.return_value = 2
-    mock_count_stories.return_value = 3
+def test_get_user_quota(session_route_mocks, client):
+    session_route_mocks.count_user_sessions.return_value = 2
+    session_route_mocks.count_user_stories.return_value = 3
 
     resp = client.get("/api/user/quota")
     assert resp.status_code == 200
@@ -289,19 +304,10 @@ def test_get_user_quota(mock_auth, mock_count_stories, mock_count_sessions, clie
 # =============================================================================
 
 
-@patch("routes.session_routes.save_object")
-@patch("routes.session_routes.create_metadata")
-@patch("routes.session_routes.check_user_session_limit")
-@patch("routes.session_routes.get_user_from_request")
-def test_create_session_formdata_success(
-    mock_auth, mock_limit, mock_md, mock_save, client
-):
+def test_create_session_formdata_success(session_route_mocks, client):
     """Test creating a session using FormData with file upload."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-    mock_limit.return_value = True
+    mock_md = session_route_mocks.create_metadata
+    mock_save = session_route_mocks.save_object
     mock_md.return_value = {
         "id": "sess-formdata-1",
         "type": "session",
@@ -345,38 +351,17 @@ def test_create_session_formdata_success(
     assert storage_data["data"] == test_data
 
 
-@patch("routes.session_routes.get_user_from_request")
-def test_create_session_json_no_longer_supported(mock_auth, client):
+def test_create_session_json_no_longer_supported(session_route_mocks, client):
     """Test that JSON-based session creation is no longer supported."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-
-    payload = {
-        "filename": "legacy.mvstory",
-        "title": "Legacy Session",
-        "description": "Testing legacy JSON",
-        "data": _b64_msgpack({"version": 1, "story": {"scenes": []}}),
-        "tags": [],
-    }
-
-    resp = client.post("/api/session", json=payload)
+    resp = client.post("/api/session", data=_LEGACY_SESSION_JSON, content_type=_JSON)
     assert resp.status_code == 400
 
-    body = resp.get_json()
-    assert "Session creation requires FormData" in body["message"]
-    assert "Legacy JSON format is no longer supported" in body["message"]
+    assert b"Session creation requires FormData" in resp.data
+    assert b"Legacy JSON format is no longer supported" in resp.data
 
 
-@patch("routes.session_routes.get_user_from_request")
-def test_create_session_formdata_missing_file(mock_auth, client):
+def test_create_session_formdata_missing_file(session_route_mocks, client):
     """Test FormData request without file upload returns error."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-
     form_data = {
         "title": "Test Session",
         "description": "Missing file",
@@ -388,18 +373,11 @@ def test_create_session_formdata_missing_file(mock_auth, client):
     # Don't set content_type explicitly - let Flask test client handle it like a real browser
     resp = client.post("/api/session", data=form_data)
     assert resp.status_code == 400
-    body = resp.get_json()
-    assert "Session creation requires FormData with a file upload" in body["message"]
+    assert b"Session creation requires FormData with a file upload" in resp.data
 
 
-@patch("routes.session_routes.get_user_from_request")
-def test_create_session_formdata_invalid_filename(mock_auth, client):
+def test_create_session_formdata_invalid_filename(session_route_mocks, client):
     """Test FormData request with invalid filename extension."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-
     test_data = msgpack.packb({"version": 1, "story": {"scenes": []}})
 
     form_data = {
@@ -413,18 +391,12 @@ def test_create_session_formdata_invalid_filename(mock_auth, client):
     # Don't set content_type explicitly - let Flask test client handle it like a real browser
     resp = client.post("/api/session", data=form_data)
     assert resp.status_code == 400
-    body = resp.get_json()
-    assert ".mvstory extension" in body["message"]
+    assert b".mvstory extension" in resp.data
 
 
-@patch("routes.session_routes.update_session_by_id")
-@patch("routes.session_routes.get_user_from_request")
-def test_update_session_formdata_success(mock_auth, mock_update, client):
+def test_update_session_formdata_success(session_route_mocks, client):
     """Test updating a session using FormData with file upload."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
+    mock_update = session_route_mocks.update_session_by_id
     mock_update.return_value = {
         "id": "sess-1",
         "type": "session",
@@ -460,32 +432,21 @@ def test_update_session_formdata_success(mock_auth, mock_update, client):
     assert update_data["title"] == "Updated Session"
 
 
-@patch("routes.session_routes.minio_client")
-@patch("routes.session_routes.find_object_by_id")
-@patch("routes.session_routes.get_user_from_request")
-def test_get_session_data_new_format(mock_auth, mock_find, mock_minio, client):
+def test_get_session_data_new_format(session_route_mocks, mock_minio, client):
     """Test loading session data saved in new FormData format (raw binary)."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-    mock_find.return_value = {
+    session_route_mocks.find_object_by_id.return_value = {
         "id": "sess-1",
         "creator": {"id": "user-123"},
         "title": "Test Session",
     }
 
     # Mock deflated binary data (like what FormData actually saves - msgpack + deflate)
-    import zlib
-
     test_session_data = msgpack.packb({"version": 1, "story": {"scenes": []}})
     deflated_data = zlib.compress(
         test_session_data, level=3
     )  # This will cause ExtraData when trying to unpack as msgpack
 
-    mock_response = Mock()
-    mock_response.read.return_value = deflated_data
-    mock_minio.get_object.return_value = mock_response
+    mock_minio.get_object.return_value = _minio_response(deflated_data)
 
     resp = client.get("/api/session/sess-1/data")
     assert resp.status_code == 200
@@ -495,16 +456,9 @@ def test_get_session_data_new_format(mock_auth, mock_find, mock_minio, client):
     assert resp.get_json() == expected_base64
 
 
-@patch("routes.session_routes.minio_client")
-@patch("routes.session_routes.find_object_by_id")
-@patch("routes.session_routes.get_user_from_request")
-def test_get_session_data_legacy_format(mock_auth, mock_find, mock_minio, client):
+def test_get_session_data_legacy_format(session_route_mocks, mock_minio, client):
     """Test loading session data saved in legacy format (msgpack wrapper)."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
-    mock_find.return_value = {
+    session_route_mocks.find_object_by_id.return_value = {
         "id": "sess-1",
         "creator": {"id": "user-123"},
         "title": "Test Session",
@@ -520,9 +474,7 @@ def test_get_session_data_legacy_format(mock_auth, mock_find, mock_minio, client
     }
     legacy_binary = msgpack.packb(legacy_wrapper)
 
-    mock_response = Mock()
-    mock_response.read.return_value = legacy_binary
-    mock_minio.get_object.return_value = mock_response
+    mock_minio.get_object.return_value = _minio_response(legacy_binary)
 
     resp = client.get("/api/session/sess-1/data")
     assert resp.status_code == 200
@@ -532,14 +484,9 @@ def test_get_session_data_legacy_format(mock_auth, mock_find, mock_minio, client
     assert resp.get_json() == expected_base64
 
 
-@patch("routes.session_routes.update_session_by_id")
-@patch("routes.session_routes.get_user_from_request")
-def test_update_session_formdata_partial_update(mock_auth, mock_update, client):
+def test_update_session_formdata_partial_update(session_route_mocks, client):
     """Test updating a session with FormData but no file (partial update)."""
-    mock_auth.return_value = (
-        {"sub": "user-123", "name": "Test User", "email": "test@example.com"},
-        "user-123",
-    )
+    mock_update = session_route_mocks.update_session_by_id
     mock_update.return_value = {
         "id": "sess-1",
         "type": "session",
@@ -1,13 +1,57 @@
 """Minimal critical tests for the main Flask application."""
 
+import io
+import sys
 from typing import List
 
+import orjson
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import handle_file_too_large, validate_request_size
+from utils import SizeValidationMiddleware
+
+_LARGE = str(51 * 1024 * 1024)
+
+# Minimal WSGI environ for driving app.wsgi_app directly; copy before use.
+_BASE_ENVIRON = {
+    "REQUEST_METHOD": "GET",
+    "SCRIPT_NAME": "",
+    "PATH_INFO": "/ready",
+    "QUERY_STRING": "",
+    "SERVER_NAME": "localhost",
+    "SERVER_PORT": "80",
+    "SERVER_PROTOCOL": "HTTP/1.1",
+    "wsgi.version": (1, 0),
+    "wsgi.url_scheme": "http",
+    "wsgi.input": io.BytesIO(b""),
+    "wsgi.errors": sys.stderr,
+    "wsgi.multithread": False,
+    "wsgi.multiprocess": False,
+    "wsgi.run_once": False,
+}
+
+
+def _wsgi_call(app, method, path, headers=()):
+    """Call app.wsgi_app directly and return (status, headers dict)."""
+    environ = dict(_BASE_ENVIRON, REQUEST_METHOD=method, PATH_INFO=path)
+    for name, value in headers:
+        environ["HTTP_" + name.upper().replace("-", "_")] = value
+
+    captured = []
+    body = app.wsgi_app(environ, lambda s, h: captured.append((s, dict(h))))
+    b"".join(body)
+    return captured[0]
+
 
 def test_health_check(client):
     response = client.get("/ready")
     assert response.status_code == 200
     assert response.is_json
     assert response.get_json()["status"] == "healthy"
+    assert response.data.rstrip() == orjson.dumps(
+        {"message": "Service is ready", "status": "healthy"}
+    )
 
 
 def test_blueprints_registered(app):
@@ -15,3 +59,64 @@ def test_blueprints_registered(app):
     assert "sessions" in blueprint_names
     assert "stories" in blueprint_names
     assert "admin" in blueprint_names
+
+
+def test_wsgi_middleware_added(app):
+    assert isinstance(app.wsgi_app, SizeValidationMiddleware)
+
+    statuses = []
+    body = app.wsgi_app(dict(_BASE_ENVIRON), lambda s, h: statuses.append(s))
+    assert b"healthy" in b"".join(body)
+    assert statuses == ["200 OK"]
+
+
+@pytest.mark.parametrize(
+    "method, environ, expected_status",
+    [
+        pytest.param("GET", {"CONTENT_LENGTH": _LARGE}, None, id="get-skipped"),
+        pytest.param("POST", {"CONTENT_LENGTH": "1024"}, None, id="small-post"),
+        pytest.param("POST", {"CONTENT_LENGTH": _LARGE}, 413, id="large-post-413"),
+        pytest.param("PUT", {"CONTENT_LENGTH": _LARGE}, 413, id="large-put-413"),
+        pytest.param("POST", {}, None, id="no-content-length"),
+    ],
+)
+def test_validate_request_size(request_ctx, method, environ, expected_status):
+    with request_ctx("/api/session", method=method, environ_overrides=environ):
+        result = validate_request_size()
+
+    if expected_status is None:
+        assert result is None
+    else:
+        response, status = result
+        assert status == expected_status
+        assert response.get_json()["details"]["type"] == "PayloadTooLarge"
+
+
+def test_request_entity_too_large_handler(app):
+    # The handler only reads current_app.config, so an app context suffices
+    with app.app_context():
+        response, status = handle_file_too_large(RequestEntityTooLarge())
+    assert status == 413
+    assert response.get_json()["details"]["max_size_mb"] == 50
+
+
+def test_cors_headers_present(app):
+    status, headers = _wsgi_call(
+        app, "GET", "/ready", [("Origin", "http://localhost:3000")]
+    )
+    assert status == "200 OK"
+    assert headers["Access-Control-Allow-Origin"] == "http://localhost:3000"
+
+
+def test_cors_preflight_request(app):
+    status, headers = _wsgi_call(
+        app,
+        "OPTIONS",
+        "/ready",
+        [
+            ("Origin", "http://localhost:3000"),
+            ("Access-Control-Request-Method", "POST"),
+        ],
+    )
+    assert status == "200 OK"
+    assert "POST" in headers["Access-Control-Allow-Methods"]
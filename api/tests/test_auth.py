@@ -0,0 +1,227 @@
+"""Minimal auth tests for the OIDC userinfo call and token extraction."""
+
+import email.message
+from types import SimpleNamespace
+
+import pytest
+import requests
+from jose import jwt
+from requests.cookies import extract_cookies_to_jar
+
+import auth
+from auth import (
+    clear_userinfo_cache,
+    get_cached_userinfo,
+    get_user_from_request,
+    make_userinfo_request,
+    session_required,
+)
+from error_handlers import APIError
+
+
+@pytest.fixture(autouse=True)
+def _empty_userinfo_cache():
+    clear_userinfo_cache()
+    yield
+    clear_userinfo_cache()
+
+
+class _FakeGet:
+    """Stand-in for auth._SESSION.get that returns (or raises) a canned result."""
+
+    def __init__(self, result):
+        self._result = result
+        self.calls = []
+
+    def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if isinstance(self._result, Exception):
+            raise self._result
+        return self._result
+
+
+def _response(payload):
+    return SimpleNamespace(json=lambda: payload, raise_for_status=lambda: None)
+
+
+class _Clock:
+    """Stand-in for auth.time whose monotonic and wall clocks advance together."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1_700_000_000.0 + self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr("auth.time", fake)
+    return fake
+
+
+def test_make_userinfo_request_success(monkeypatch, mock_userinfo):
+    monkeypatch.delenv("OIDC_USERINFO_URL", raising=False)
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+
+    assert make_userinfo_request("test-token") == mock_userinfo
+    assert fake_get.calls == [
+        (
+            ("https://login.aai.lifescience-ri.eu/oidc/userinfo",),
+            {"headers": {"Authorization": "Bearer test-token"}, "timeout": 5},
+        )
+    ]
+
+
+def test_userinfo_session_refuses_cookies():
+    request = requests.Request("GET", "https://test-oidc/userinfo").prepare()
+    headers = email.message.Message()
+    headers["Set-Cookie"] = "sid=abc; Path=/"
+    response = SimpleNamespace(_original_response=SimpleNamespace(msg=headers))
+
+    extract_cookies_to_jar(auth._SESSION.cookies, request, response)
+    assert len(auth._SESSION.cookies) == 0
+
+
+def test_make_userinfo_request_with_custom_endpoint(monkeypatch, mock_userinfo):
+    monkeypatch.setenv("OIDC_USERINFO_URL", "http://custom-oidc/userinfo")
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+
+    make_userinfo_request("test-token")
+    assert fake_get.calls[0][0] == ("http://custom-oidc/userinfo",)
+
+
+def test_make_userinfo_request_failure(monkeypatch):
+    error = requests.exceptions.ConnectionError("boom")
+    monkeypatch.setattr("auth._SESSION.get", _FakeGet(error))
+
+    with pytest.raises(APIError) as e:
+        make_userinfo_request("test-token")
+    assert e.value.status_code == 401
+    assert e.value.details == {"error": "boom"}
+
+
+@pytest.mark.parametrize(
+    "auth_header, expected_msg",
+    [
+        ("test-token", "Invalid token format"),
+        ("Basic test-token", "Invalid token format"),
+        ("Bearer test token extra", "Invalid token format"),
+        (None, "Authorization required"),
+    ],
+)
+def test_get_user_from_request_rejects_bad_header(
+    request_ctx, auth_header, expected_msg
+):
+    headers = {"Authorization": auth_header} if auth_header is not None else {}
+    with request_ctx("/api/test", headers=headers):
+        with pytest.raises(APIError) as e:
+            get_user_from_request()
+    assert e.value.status_code == 401
+    assert e.value.message == expected_msg
+
+
+def test_get_user_from_request_uses_oidc_mock(request_ctx, auth_headers, mock_userinfo):
+    with request_ctx(headers=auth_headers):
+        user_info, sub = get_user_from_request()
+    assert user_info == mock_userinfo
+    assert sub == "test-user-123"
+
+
+def test_get_user_from_request_rejects_invalid_token(request_ctx):
+    with request_ctx(headers={"Authorization": "Bearer wrong-token"}):
+        with pytest.raises(APIError) as e:
+            get_user_from_request()
+    assert e.value.status_code == 401
+    assert e.value.message == "Failed to validate token"
+
+
+def test_get_cached_userinfo_reuses_successful_lookup(monkeypatch, mock_userinfo):
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+
+    assert get_cached_userinfo("test-token") == mock_userinfo
+    assert get_cached_userinfo("test-token") == mock_userinfo
+    assert len(fake_get.calls) == 1
+
+
+def test_get_cached_userinfo_does_not_cache_failures(monkeypatch):
+    fake_get = _FakeGet(requests.exceptions.HTTPError("401"))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+
+    for _ in range(2):
+        with pytest.raises(APIError):
+            get_cached_userinfo("bad-token")
+    assert len(fake_get.calls) == 2
+
+
+def test_get_cached_userinfo_expires_after_ttl(monkeypatch, clock, mock_userinfo):
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+    monkeypatch.setattr("auth.USERINFO_CACHE_TTL", 300)
+
+    get_cached_userinfo("test-token")
+    clock.advance(299)
+    get_cached_userinfo("test-token")
+    assert len(fake_get.calls) == 1
+
+    clock.advance(1)
+    get_cached_userinfo("test-token")
+    assert len(fake_get.calls) == 2
+
+
+def test_get_cached_userinfo_stops_at_token_exp(monkeypatch, clock, mock_userinfo):
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+    monkeypatch.setattr("auth.USERINFO_CACHE_TTL", 300)
+    token = jwt.encode({"exp": clock.time() + 10}, "secret", algorithm="HS256")
+
+    get_cached_userinfo(token)
+    clock.advance(9)
+    get_cached_userinfo(token)
+    assert len(fake_get.calls) == 1
+
+    clock.advance(1)
+    get_cached_userinfo(token)
+    assert len(fake_get.calls) == 2
+
+
+def test_get_cached_userinfo_evicts_oldest(monkeypatch, clock, mock_userinfo):
+    fake_get = _FakeGet(_response(mock_userinfo))
+    monkeypatch.setattr("auth._SESSION.get", fake_get)
+    monkeypatch.setattr("auth.USERINFO_CACHE_MAX_SIZE", 2)
+
+    for token in ("a", "b", "c"):
+        get_cached_userinfo(token)
+    clock.advance(1)
+    get_cached_userinfo("c")
+    assert len(fake_get.calls) == 3
+
+    get_cached_userinfo("a")
+    assert len(fake_get.calls) == 4
+
+
+@session_required
+def _protected_view(current_user):
+    return current_user
+
+
+def test_session_required_with_valid_session(session_ctx, mock_session_user):
+    session_ctx(mock_session_user)
+    assert _protected_view() == mock_session_user
+
+
+def test_session_required_without_session(session_ctx):
+    session_ctx()
+    with pytest.raises(APIError) as e:
+        _protected_view()
+    assert e.value.status_code == 401
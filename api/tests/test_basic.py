@@ -1,14 +1,28 @@
 """Minimal sanity checks and import tests."""
 
+import importlib
 
-def test_import_core_modules():
-    from app import app  # noqa: F401
-    from config import configure_app, configure_cors  # noqa: F401
-    from error_handlers import APIError, error_handler, handle_api_error  # noqa: F401
-    from utils import (  # noqa: F401
-        SizeLimitedStream,
-        SizeValidationMiddleware,
-        validate_payload_size,
-    )
-
-    assert True
+import pytest
+
+
+@pytest.mark.parametrize(
+    "module_name, attrs",
+    [
+        ("app", ["app"]),
+        (
+            "auth",
+            ["get_user_from_request", "make_userinfo_request", "session_required"],
+        ),
+        ("config", ["configure_app", "configure_cors"]),
+        ("error_handlers", ["APIError", "error_handler", "handle_api_error"]),
+        ("storage", ["list_objects_by_type", "minio_client", "save_object"]),
+        (
+            "utils",
+            ["SizeLimitedStream", "SizeValidationMiddleware", "validate_payload_size"],
+        ),
+    ],
+)
+def test_import_core_modules(module_name, attrs):
+    module = importlib.import_module(module_name)
+    for attr in attrs:
+        assert hasattr(module, attr), f"{module_name}.{attr} is missing"
@@ -3,45 +3,50 @@
 import os
 from unittest.mock import patch
 
+import pytest
 from flask import Flask
 
 from config import configure_app
 
 
-@patch.dict(os.environ, {"MAX_UPLOAD_SIZE_MB": "25"})
-def test_configure_app_sets_max_content_length():
-    app = Flask("test_configure_app_sets_max_content_length")
-    configure_app(app)
-    assert app.config["MAX_UPLOAD_SIZE_MB"] == 25
-    assert app.config["MAX_CONTENT_LENGTH"] == 25 * 1024 * 1024
+@pytest.mark.parametrize(
+    "configured_app", [{"MAX_UPLOAD_SIZE_MB": "25"}], indirect=True
+)
+def test_configure_app_sets_max_content_length(configured_app):
+    assert configured_app.config["MAX_UPLOAD_SIZE_MB"] == 25
+    assert configured_app.config["MAX_CONTENT_LENGTH"] == 25 * 1024 * 1024
 
 
-@patch.dict(os.environ, {}, clear=True)
-def test_configure_app_uses_defaults():
-    app = Flask("test_configure_app_uses_defaults")
-    configure_app(app)
+@pytest.mark.parametrize("configured_app", [{}], indirect=True)
+def test_configure_app_uses_defaults(configured_app):
     assert (
-        app.config["OIDC_USERINFO_URL"]
+        configured_app.config["OIDC_USERINFO_URL"]
         == "https://login.aai.lifescience-ri.eu/oidc/userinfo"
     )
     # Do not assert a specific production domain here to keep tests environment-agnostic
 
 
-@patch.dict(os.environ, {"BASE_URL": "http://localhost:5000"}, clear=True)
-def test_configure_app_reads_base_url_from_env():
-    app = Flask("test_configure_app_reads_base_url_from_env")
-    configure_app(app)
-    assert app.config["BASE_URL"] == "http://localhost:5000"
+@pytest.mark.parametrize(
+    "configured_app, expected_base_url",
+    [
+        ({"BASE_URL": "http://localhost:5000"}, "http://localhost:5000"),
+        # Falls back to NEXT_PUBLIC_API_BASE_URL when BASE_URL is missing
+        (
+            {"NEXT_PUBLIC_API_BASE_URL": "http://ci-backend:5000"},
+            "http://ci-backend:5000",
+        ),
+    ],
+    indirect=["configured_app"],
+)
+def test_configure_app_base_url(configured_app, expected_base_url):
+    assert configured_app.config["BASE_URL"] == expected_base_url
 
 
-@patch.dict(
-    os.environ,
-    {"NEXT_PUBLIC_API_BASE_URL": "http://ci-backend:5000"},
-    clear=True,
-)
-def test_configure_app_falls_back_to_next_public_api_base_url_when_base_url_missing():
-    app = Flask(
-        "test_configure_app_falls_back_to_next_public_api_base_url_when_base_url_missing"
-    )
+@patch.dict(os.environ, {"FRONTEND_URL": "https://frontend.example"})
+def test_configure_cors_allows_frontend_url():
+    app = Flask("test_configure_cors_allows_frontend_url")
     configure_app(app)
-    assert app.config["BASE_URL"] == "http://ci-backend:5000"
+    response = app.test_client().get(
+        "/", headers={"Origin": "https://frontend.example"}
+    )
+    assert response.headers["Access-Control-Allow-Origin"] == "https://frontend.example"
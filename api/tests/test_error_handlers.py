@@ -11,6 +11,25 @@ def test_handle_api_error_basic(app):
         response, status = handle_api_error(error)
         assert status == 418
         assert response.get_json()["message"] == "Test error"
+        assert "details" not in response.get_json()
+
+
+def test_handle_api_error_with_details(app):
+    with app.app_context():
+        error = APIError("Test error", details={"field": "title"})
+        response, status = handle_api_error(error)
+        assert status == 400
+        assert response.get_json()["details"] == {"field": "title"}
+
+
+def test_handle_api_error_reflects_reassigned_fields(app):
+    with app.app_context():
+        error = APIError("Test error")
+        error.message, error.status_code = "Changed", 409
+        response, status = handle_api_error(error)
+        assert status == 409
+        assert response.get_json()["message"] == "Changed"
+        assert response.get_json()["status_code"] == 409
 
 
 def test_error_handler_converts_exceptions(app):
@@ -36,3 +55,15 @@ def test_error_handler_request_entity_too_large(app):
         assert status == 413
         data = resp.get_json()
         assert data["message"] == "File size too large"
+
+
+def test_error_handler_unexpected_exception(app):
+    with app.app_context():
+
+        @error_handler
+        def will_raise_key_error():
+            raise KeyError("missing")
+
+        resp, status = will_raise_key_error()
+        assert status == 500
+        assert resp.get_json()["details"]["type"] == "KeyError"
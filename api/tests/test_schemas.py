@@ -1,31 +1,89 @@
 """Minimal schema tests that exercise core validation paths."""
 
-import base64
-
-import msgpack
 import pytest
 from pydantic import ValidationError
 
-from schemas import BaseItemUpdate, SessionInput, StoryInput
+from schemas import (
+    BaseItemUpdate,
+    SessionInput,
+    SessionUpdate,
+    StoryInput,
+    get_validator,
+)
 
 
-def _base64_msgpack(obj):
-    return base64.b64encode(msgpack.packb(obj)).decode("utf-8")
+def _has_error_loc(exc, loc):
+    # Stops at the first matching error instead of collecting every loc
+    return any(err["loc"] == loc for err in exc.errors())
 
 
-def test_session_input_valid_minimal():
-    session = SessionInput(
+@pytest.fixture(scope="module")
+def session_instance(b64_msgpack_minimal):
+    """One validated SessionInput shared by tests that only read it."""
+    return SessionInput(
         filename="a.mvstory",
         title="t",
         description="d",
-        data=_base64_msgpack({"k": 1}),
+        data=b64_msgpack_minimal,
+        tags=["test"],
     )
-    assert session.filename.endswith(".mvstory")
 
 
-def test_session_input_missing_required_field():
-    with pytest.raises(ValidationError):
-        SessionInput(title="t", description="d", data=_base64_msgpack({}))
+def test_session_input_valid_minimal(session_instance):
+    assert session_instance.filename.endswith(".mvstory")
+
+
+def test_session_input_to_dict(session_instance, b64_msgpack_minimal):
+    assert session_instance.dict() == {
+        "filename": "a.mvstory",
+        "title": "t",
+        "description": "d",
+        "tags": ["test"],
+        "data": b64_msgpack_minimal,
+    }
+
+
+@pytest.mark.parametrize(
+    "model, bad_data, expected_loc",
+    [
+        pytest.param(
+            SessionInput, {"title": "t"}, ("filename",), id="session-missing-filename"
+        ),
+        pytest.param(
+            SessionInput,
+            {"filename": "a.txt"},
+            ("filename",),
+            id="session-wrong-extension",
+        ),
+        pytest.param(
+            SessionInput,
+            {"filename": "a.mvstory", "data": "not-msgpack"},
+            ("data",),
+            id="session-invalid-data",
+        ),
+        pytest.param(
+            SessionInput,
+            {"filename": "a.mvstory", "tags": "abc"},
+            ("tags",),
+            id="session-invalid-tags",
+        ),
+        pytest.param(
+            StoryInput, {"filename": "s.txt"}, ("filename",), id="story-wrong-extension"
+        ),
+        pytest.param(
+            StoryInput,
+            {"filename": "s.mvsj", "id": "x"},
+            ("id",),
+            id="story-extra-field",
+        ),
+    ],
+)
+def test_input_validation_errors(model, bad_data, expected_loc, b64_msgpack_minimal):
+    if model is SessionInput:
+        bad_data = {"data": b64_msgpack_minimal, **bad_data}
+    with pytest.raises(ValidationError) as e:
+        model(**bad_data)
+    assert _has_error_loc(e.value, expected_loc)
 
 
 def test_story_input_valid_minimal():
@@ -33,6 +91,33 @@ def test_story_input_valid_minimal():
     assert story.filename.endswith(".mvsj")
 
 
-def test_base_item_update_partial():
-    upd = BaseItemUpdate(description="x")
+def test_input_default_values():
+    # Only the declared defaults are under test, so skip the validators
+    story = StoryInput.construct(filename="s.mvsj")
+    assert story.title == story.description == ""
+    assert story.tags == []
+    assert story.data is None
+
+
+@pytest.fixture(params=[BaseItemUpdate, SessionUpdate])
+def update_cls(request):
+    return request.param
+
+
+def test_update_partial(update_cls):
+    upd = update_cls(description="x")
     assert upd.description == "x"
+    assert upd.dict(exclude_none=True) == {"description": "x"}
+
+
+def test_update_rejects_long_tag(update_cls):
+    with pytest.raises(ValidationError) as e:
+        update_cls(tags=["x" * 51])
+    assert _has_error_loc(e.value, ("tags",))
+
+
+def test_validator_cache_reuse():
+    assert get_validator("base_metadata") is get_validator("base_metadata")
+    creator = {"id": "u", "name": "n", "email": "e"}
+    assert get_validator("creator").is_valid(creator)
+    assert not get_validator("creator").is_valid({**creator, "extra": 1})
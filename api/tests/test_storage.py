@@ -1,35 +1,103 @@
 """Minimal storage tests for client, utils, metadata, and quota paths."""
 
+import base64
+import json
+import threading
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
+from minio.error import S3Error
 
+import storage
 from error_handlers import APIError
+from storage import client
+from storage.client import (
+    count_minio_objects,
+    ensure_bucket_exists,
+    handle_minio_error,
+    list_minio_objects,
+)
+from storage.metadata import create_metadata, validate_data_filename, validate_metadata
+from storage.objects import (
+    INLINE_METADATA_HEADER,
+    METADATA_FETCH_WORKERS,
+    clear_metadata_cache,
+    delete_many,
+    list_objects_by_type,
+)
+from storage.quota import check_user_session_limit, count_user_sessions
+from storage.utils import get_content_type, get_data_file_extension, get_object_path
 
 
-def test_minio_configuration_reload(monkeypatch):
-    monkeypatch.setenv("MINIO_ENDPOINT", "http://minio:9000")
-    monkeypatch.setenv("MINIO_ACCESS_KEY", "a")
-    monkeypatch.setenv("MINIO_SECRET_KEY", "b")
-    monkeypatch.setenv("MINIO_BUCKET", "root")
-    import importlib
+@pytest.fixture
+def restore_minio_config(monkeypatch):
+    # configure() and reload_config() rebind module globals; restore them after
+    for name in (
+        "_CFG",
+        "MINIO_ENDPOINT",
+        "MINIO_BUCKET",
+        "MINIO_ACCESS_KEY",
+        "MINIO_SECRET_KEY",
+        "MINIO_SECURE",
+        "MINIO_ENABLED",
+        "MINIO_HOST",
+        "minio_client",
+        "_bucket_ready",
+    ):
+        monkeypatch.setattr(client, name, getattr(client, name))
 
-    from storage import client
 
-    importlib.reload(client)
+def test_configure_reuses_http_pool(restore_minio_config):
+    client.configure("http://minio:9000", "a", "b", "root")
     assert client.MINIO_ENDPOINT == "http://minio:9000"
+    assert client.MINIO_HOST == "minio:9000"
     assert client.MINIO_BUCKET == "root"
+    assert client.minio_client._http is client._HTTP
+
+
+def test_reload_config_keeps_client_for_bucket_change(
+    monkeypatch, restore_minio_config
+):
+    monkeypatch.setenv("MINIO_ENDPOINT", "http://test-endpoint:9000")
+    monkeypatch.setenv("MINIO_ACCESS_KEY", "a")
+    monkeypatch.setenv("MINIO_SECRET_KEY", "b")
+    client.reload_config()
+    minio = client.minio_client
+    assert client.current_config().endpoint == "http://test-endpoint:9000"
+
+    monkeypatch.setenv("MINIO_BUCKET", "other")
+    client.reload_config()
+    assert client.current_config().bucket == "other"
+    assert client.minio_client is minio
+
 
+def test_configure_reaches_storage_objects(restore_minio_config):
+    client.configure("http://minio:9000", "a", "b", "other")
+    assert storage.minio_client is client.minio_client
+    assert storage.MINIO_BUCKET == "other"
 
-def test_handle_minio_error_wraps_s3_error():
-    from minio.error import S3Error
+    with patch.object(client.minio_client, "remove_objects", return_value=[]) as rm:
+        assert delete_many(["u/sessions/1/metadata.json"]) == [
+            "u/sessions/1/metadata.json"
+        ]
+    assert rm.call_args.args[0] == "other"
 
-    from storage.client import handle_minio_error
 
+@pytest.mark.parametrize(
+    "code, status_code, message",
+    [
+        ("x", 500, "Storage operation failed: op"),
+        ("NoSuchKey", 404, "Object not found during op"),
+        ("SlowDown", 503, "Storage is busy during op"),
+    ],
+)
+@patch("storage.client.MINIO_ENABLED", True)
+def test_handle_minio_error_maps_s3_error(code, status_code, message):
     @handle_minio_error("op")
     def fn():
         raise S3Error(
-            code="x",
+            code=code,
             message="y",
             resource="r",
             request_id="i",
@@ -39,25 +107,158 @@ def test_handle_minio_error_wraps_s3_error():
 
     with pytest.raises(APIError) as e:
         fn()
-    assert "Storage operation failed: op" in str(e.value.message)
+    assert e.value.status_code == status_code
+    assert e.value.message == message
 
 
-def test_storage_utils_paths():
-    from storage.utils import get_content_type, get_data_file_extension, get_object_path
+@patch("storage.client.MINIO_ENABLED", True)
+def test_handle_minio_error_keeps_nested_api_error():
+    @handle_minio_error("inner")
+    def inner():
+        raise S3Error(
+            code="NoSuchKey",
+            message="y",
+            resource="r",
+            request_id="i",
+            host_id="h",
+            response=None,
+        )
+
+    @handle_minio_error("outer")
+    def outer():
+        return inner()
+
+    with pytest.raises(APIError) as e:
+        outer()
+    assert e.value.status_code == 404
+    assert e.value.message == "Object not found during inner"
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", False)
+def test_ensure_bucket_exists_checks_once(mock_minio):
+    ensure_bucket_exists()
+    ensure_bucket_exists()
+    mock_minio.bucket_exists.assert_called_once_with(client.MINIO_BUCKET)
+    mock_minio.make_bucket.assert_not_called()
+
+
+def _minio_objects(*names):
+    return [
+        SimpleNamespace(object_name=name, size=1, last_modified=None, etag="e")
+        for name in names
+    ]
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_list_minio_objects_skips_directory_markers(mock_minio):
+    mock_minio.list_objects.return_value = _minio_objects("u/sessions/", "u/a.json")
+    assert list_minio_objects("u/") == [
+        {"key": "u/a.json", "size": 1, "last_modified": None, "etag": "e"}
+    ]
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_list_objects_by_type_reads_inline_metadata(mock_minio):
+    md = {"id": "1", "type": "session", "creator": {"id": "u"}}
+    listing = _minio_objects("u/sessions/1/metadata.json", "u/sessions/1/data.mvstory")
+    listing[0].metadata = {
+        INLINE_METADATA_HEADER: base64.b64encode(json.dumps(md).encode()).decode()
+    }
+    mock_minio.list_objects.return_value = listing
+
+    assert list_objects_by_type("session", user_id="u") == [md]
+    assert mock_minio.list_objects.call_args.kwargs["include_user_meta"] is True
+    assert mock_minio.get_object.call_count == 0
+
 
+@pytest.fixture
+def empty_metadata_cache():
+    clear_metadata_cache()
+    yield
+    clear_metadata_cache()
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_list_objects_by_type_caches_metadata_by_etag(mock_minio, empty_metadata_cache):
+    md = {"id": "1", "type": "session", "creator": {"id": "u"}}
+    mock_minio.list_objects.side_effect = lambda *a, **kw: _minio_objects(
+        "u/sessions/1/metadata.json"
+    )
+    mock_minio.get_object.return_value.read.return_value = json.dumps(md).encode()
+
+    assert list_objects_by_type("session", user_id="u") == [md]
+    assert list_objects_by_type("session", user_id="u") == [md]
+    assert mock_minio.get_object.call_count == 1
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_list_objects_by_type_fetches_metadata_concurrently(
+    mock_minio, empty_metadata_cache
+):
+    workers = METADATA_FETCH_WORKERS
+    mock_minio.list_objects.return_value = _minio_objects(
+        *(f"u/sessions/{i}/metadata.json" for i in range(workers))
+    )
+    body = json.dumps({"type": "session"}).encode()
+    # Every GET waits until all workers are inside get_object at once; serial
+    # fetches would break the barrier instead
+    barrier = threading.Barrier(workers, timeout=5)
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def get_object(bucket, name):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        barrier.wait()
+        with lock:
+            in_flight -= 1
+        return SimpleNamespace(read=lambda: body, close=lambda: None)
+
+    mock_minio.get_object.side_effect = get_object
+
+    assert len(list_objects_by_type("session", user_id="u")) == workers
+    assert peak == workers
+
+
+def test_delete_many_batches_keys(mock_minio):
+    keys = [f"u/sessions/{i}/metadata.json" for i in range(250)]
+    mock_minio.remove_objects.return_value = [
+        SimpleNamespace(name=keys[0], message="denied")
+    ]
+
+    assert delete_many(keys) == keys[1:]
+    mock_minio.remove_objects.assert_called_once()
+    bucket, objects = mock_minio.remove_objects.call_args.args
+    assert [obj.name for obj in objects] == keys
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_count_minio_objects_stops_at_cap(mock_minio):
+    listing = iter(_minio_objects("a", "b", "c", "d"))
+    mock_minio.list_objects.return_value = listing
+    assert count_minio_objects("", cap=2) == 2
+    assert next(listing).object_name == "c"
+
+
+def test_storage_utils_paths():
     metadata = {"id": "id", "creator": {"id": "u"}}
     assert get_object_path(metadata, "session") == "u/sessions/id"
+    assert get_object_path(metadata, "story") == "u/stories/id"
     assert get_data_file_extension("session") == ".mvstory"
     assert get_content_type("story") == "application/json"
+    assert get_content_type("session") == "application/x-deflate"
+    assert get_data_file_extension("story", "x.mvsx") == ".mvsx"
 
 
 def test_metadata_validation_and_filename():
-    from storage.metadata import (
-        create_metadata,
-        validate_data_filename,
-        validate_metadata,
-    )
-
     user = {"sub": "u", "name": "n", "email": "e"}
     md = create_metadata("session", user)
     assert md["creator"]["id"] == "u"
@@ -65,12 +266,38 @@ def test_metadata_validation_and_filename():
     assert validate_data_filename("x.mvstory", "session") is True
     with pytest.raises(APIError):
         validate_data_filename("x.txt", "session")
+    assert validate_data_filename("x.mvsx", "story") is True
+    with pytest.raises(APIError):
+        validate_data_filename("x.mvsj", "unknown")
 
 
-@patch("storage.objects.list_objects_by_type")
-def test_quota_counts(mock_list):
-    mock_list.return_value = [{"id": "1"}, {"id": "2"}]
+def test_validate_metadata_reports_schema_error():
+    with pytest.raises(APIError) as e:
+        validate_metadata({"id": "id"}, "story")
+    assert e.value.status_code == 400
+    assert "is a required property" in e.value.details["validation_error"]
+
 
-    from storage.quota import count_user_sessions
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_quota_counts(mock_minio):
+    mock_minio.list_objects.return_value = _minio_objects(
+        "u/sessions/1/metadata.json",
+        "u/sessions/1/data.mvstory",
+        "u/sessions/2/metadata.json",
+    )
 
     assert count_user_sessions("u") == 2
+    assert mock_minio.list_objects.call_args.kwargs["prefix"] == "u/sessions/"
+
+
+@patch("storage.client.MINIO_ENABLED", True)
+@patch("storage.client._bucket_ready", True)
+def test_session_limit_check_reads_only_limit_plus_one(mock_minio):
+    listing = iter(_minio_objects(*(f"u/sessions/{i}/metadata.json" for i in range(5))))
+    mock_minio.list_objects.return_value = listing
+
+    with pytest.raises(APIError) as e:
+        check_user_session_limit("u", 2)
+    assert e.value.status_code == 429
+    assert len(list(listing)) == 2
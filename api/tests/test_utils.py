@@ -1,15 +1,22 @@
 """Minimal utils tests to cover payload decorator, stream wrapper, and middleware."""
 
 import io
+import json
+from unittest.mock import Mock
 
 import pytest
 from werkzeug.exceptions import RequestEntityTooLarge
 
-from utils import SizeLimitedStream, SizeValidationMiddleware, validate_payload_size
+from utils import (
+    CONTENT_LENGTH_ENVIRON_KEY,
+    SizeLimitedStream,
+    SizeValidationMiddleware,
+    validate_payload_size,
+)
 
 
-def test_validate_payload_size_no_content_length(app):
-    with app.test_request_context("/"):
+def test_validate_payload_size_no_content_length(request_ctx):
+    with request_ctx("/"):
 
         @validate_payload_size()
         def view():
@@ -20,6 +27,33 @@ def test_validate_payload_size_no_content_length(app):
         assert resp.get_json()["message"].startswith("Content-Length header required")
 
 
+def test_validate_payload_size_custom_limit(request_ctx):
+    @validate_payload_size(max_size_mb=1)
+    def view():
+        return {"ok": True}
+
+    with request_ctx(
+        "/", method="POST", environ_overrides={"CONTENT_LENGTH": "1048577"}
+    ):
+        resp, status = view()
+    assert status == 413
+    assert resp.get_json()["details"]["max_size_mb"] == 1
+
+    with request_ctx("/", method="POST", environ_overrides={"CONTENT_LENGTH": "1"}):
+        assert view() == {"ok": True}
+
+
+def test_validate_payload_size_reuses_middleware_length(request_ctx):
+    @validate_payload_size(max_size_mb=1)
+    def view():
+        return {"ok": True}
+
+    # No CONTENT_LENGTH header: only the middleware's parsed value is present
+    overrides = {CONTENT_LENGTH_ENVIRON_KEY: 10}
+    with request_ctx("/", method="POST", environ_overrides=overrides):
+        assert view() == {"ok": True}
+
+
 def test_size_limited_stream_exceeds_limit():
     data = b"x" * 20
     stream = io.BytesIO(data)
@@ -28,23 +62,90 @@ def test_size_limited_stream_exceeds_limit():
         limited.read()
 
 
-def test_size_validation_middleware_rejects_large_request():
+def test_size_limited_stream_reads_lines_within_limit():
+    limited = SizeLimitedStream(io.BytesIO(b"a\nbb\nccc\n"), max_size=9)
+    assert limited.readline() == b"a\n"
+    assert limited.readlines() == [b"bb\n", b"ccc\n"]
+    assert limited.tell() == limited.bytes_read == 9
+    assert not limited.seekable()
+
+    limited = SizeLimitedStream(io.BytesIO(b"x" * 20), max_size=10)
+    assert limited.read(6) == b"x" * 6
+    buffer = bytearray(6)
+    with pytest.raises(RequestEntityTooLarge):
+        limited.readinto(buffer)
+    assert buffer == b"x" * 5 + b"\x00"
+
+
+# A sentinel body stands in for the payload, so even a 1 GiB declared
+# length costs nothing to test
+@pytest.mark.parametrize("content_length", ["2048", str(1 << 30)])
+def test_size_validation_middleware_rejects_large_request(content_length):
     def dummy_app(environ, start_response):
         start_response("200 OK", [("Content-Type", "text/plain")])
         return [b"OK"]
 
-    middleware = SizeValidationMiddleware(dummy_app, max_size_bytes=1024)
-    large_size = 2048
-    environ = {
-        "CONTENT_LENGTH": str(large_size),
-        "wsgi.input": io.BytesIO(b"x" * large_size),
-    }
+    logger = Mock()
+    middleware = SizeValidationMiddleware(dummy_app, max_size_bytes=1024, logger=logger)
+    body = Mock(spec=io.RawIOBase)
+    environ = {"CONTENT_LENGTH": content_length, "wsgi.input": body}
 
     status_holder = {}
 
     def start_response(status, headers):
         status_holder["status"] = status
+        status_holder["headers"] = dict(headers)
 
     result = list(middleware(environ, start_response))
     assert status_holder["status"].startswith("413")
     assert isinstance(result, list) and result
+    assert status_holder["headers"] == {
+        "Content-Type": "application/json",
+        "Content-Length": str(len(result[0])),
+    }
+    # Rejected on the header alone: the body is never read or wrapped
+    assert environ["wsgi.input"] is body
+    assert body.method_calls == []
+    logger.warning.assert_called_once_with(
+        "WSGI middleware rejected large request: %d bytes", int(content_length)
+    )
+
+
+def test_size_validation_middleware_wraps_only_unbounded_input():
+    environs = []
+
+    def dummy_app(environ, start_response):
+        environs.append(environ)
+        return [b"OK"]
+
+    middleware = SizeValidationMiddleware(dummy_app, max_size_bytes=1024)
+    body = io.BytesIO(b"x" * 10)
+    middleware({"CONTENT_LENGTH": "10", "wsgi.input": body}, None)
+    # Werkzeug reads an invalid length as an empty body
+    middleware({"CONTENT_LENGTH": "invalid", "wsgi.input": body}, None)
+    middleware({"wsgi.input": body}, None)
+    chunked = {"HTTP_TRANSFER_ENCODING": "chunked", "CONTENT_LENGTH": "10"}
+    middleware(dict(chunked, **{"wsgi.input": body}), None)
+    seen = [environ["wsgi.input"] for environ in environs]
+    assert seen[0] is seen[1] is body
+    assert isinstance(seen[2], SizeLimitedStream)
+    assert isinstance(seen[3], SizeLimitedStream)
+    # The parsed length is left in the environ for validate_payload_size
+    assert [e[CONTENT_LENGTH_ENVIRON_KEY] for e in environs] == [10, 0, None, None]
+
+
+def test_size_validation_middleware_skips_ready_endpoint():
+    body = Mock(spec=io.RawIOBase)
+    environ = {"PATH_INFO": "/ready", "CONTENT_LENGTH": "2048", "wsgi.input": body}
+
+    middleware = SizeValidationMiddleware(lambda e, s: [b"OK"], max_size_bytes=1024)
+    assert middleware(environ, None) == [b"OK"]
+    assert environ["wsgi.input"] is body
+
+
+def test_size_validation_middleware_error_body():
+    middleware = SizeValidationMiddleware(None, max_size_bytes=1024 * 1024)
+    details = json.loads(middleware._create_error_response(3 * 1024 * 1024))["details"]
+    assert details["max_size_mb"] == 1.0
+    assert details["received_size_mb"] == 3.0
+    assert "received_size_mb" not in json.loads(middleware._error_body)["details"]
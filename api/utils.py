@@ -1,13 +1,20 @@
 """Utility functions and decorators."""
 
+import io
+import json
 import logging
 from functools import wraps
 
 from flask import current_app, jsonify, request
 from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.wsgi import get_content_length
 
 logger = logging.getLogger(__name__)
 
+# Environ key where SizeValidationMiddleware stores the parsed Content-Length
+CONTENT_LENGTH_ENVIRON_KEY = "mol_view_stories.content_length"
+_UNSET = object()
+
 
 def validate_payload_size(max_size_mb=None):
     """
@@ -20,71 +27,42 @@ def validate_payload_size(max_size_mb=None):
     Args:
         max_size_mb: Maximum size in MB. If None, uses app config value.
     """
+    # A fixed limit is converted once here; None defers to the app config
+    fixed_max_size_bytes = None if max_size_mb is None else max_size_mb * 1024 * 1024
 
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Get max size from app config if not specified
-            if max_size_mb is None:
+            if fixed_max_size_bytes is None:
                 max_size_mb_config = current_app.config.get("MAX_UPLOAD_SIZE_MB", 50)
+                max_size_bytes = max_size_mb_config * 1024 * 1024
             else:
                 max_size_mb_config = max_size_mb
+                max_size_bytes = fixed_max_size_bytes
 
-            max_size_bytes = max_size_mb_config * 1024 * 1024
-
-            # Check Content-Length header if present
-            content_length = request.content_length
-            if content_length is not None:
-                if content_length > max_size_bytes:
-                    logger.warning(
-                        f"Request payload too large: {content_length} bytes (max: {max_size_bytes} bytes)"
-                    )
-                    return (
-                        jsonify(
-                            {
-                                "error": True,
-                                "message": "Request payload too large",
-                                "status_code": 413,
-                                "details": {
-                                    "type": "PayloadTooLarge",
-                                    "description": (
-                                        f"The request payload exceeds the maximum "
-                                        f"allowed size of {max_size_mb_config}MB"
-                                    ),
-                                    "max_size_mb": max_size_mb_config,
-                                    "received_size_mb": round(
-                                        content_length / (1024 * 1024), 2
-                                    ),
-                                    "suggestion": "Please reduce the payload size and try again",
-                                },
-                            }
-                        ),
-                        413,
-                    )
-            else:
+            # Reuse the length SizeValidationMiddleware already parsed
+            content_length = request.environ.get(CONTENT_LENGTH_ENVIRON_KEY, _UNSET)
+            if content_length is _UNSET:
+                content_length = request.content_length
+            if content_length is None:
                 # CRITICAL FIX: Reject requests without Content-Length header
                 # This prevents chunked transfer encoding from bypassing limits
                 logger.warning(
                     "Request missing Content-Length header - rejecting to prevent bypass"
                 )
+                return jsonify(_missing_content_length_body(max_size_mb_config)), 400
+
+            if content_length > max_size_bytes:
+                logger.warning(
+                    "Request payload too large: %d bytes (max: %d bytes)",
+                    content_length,
+                    max_size_bytes,
+                )
                 return (
                     jsonify(
-                        {
-                            "error": True,
-                            "message": "Content-Length header required",
-                            "status_code": 400,
-                            "details": {
-                                "type": "MissingContentLength",
-                                "description": (
-                                    f"Content-Length header is required for uploads. "
-                                    f"Maximum allowed size: {max_size_mb_config}MB"
-                                ),
-                                "max_size_mb": max_size_mb_config,
-                                "suggestion": "Ensure your client sends Content-Length header",
-                            },
-                        }
+                        _payload_too_large_body(max_size_mb_config, content_length)
                     ),
-                    400,
+                    413,
                 )
 
             return f(*args, **kwargs)
@@ -94,97 +72,140 @@ def validate_payload_size(max_size_mb=None):
     return decorator
 
 
-class SizeLimitedStream:
-    """Stream wrapper that enforces size limits during reading."""
+def _payload_too_large_body(max_size_mb, content_length):
+    """Error body for a request whose Content-Length exceeds the limit."""
+    return {
+        "error": True,
+        "message": "Request payload too large",
+        "status_code": 413,
+        "details": {
+            "type": "PayloadTooLarge",
+            "description": (
+                f"The request payload exceeds the maximum "
+                f"allowed size of {max_size_mb}MB"
+            ),
+            "max_size_mb": max_size_mb,
+            "received_size_mb": round(content_length / (1024 * 1024), 2),
+            "suggestion": "Please reduce the payload size and try again",
+        },
+    }
+
+
+def _missing_content_length_body(max_size_mb):
+    """Error body for an upload sent without a Content-Length header."""
+    return {
+        "error": True,
+        "message": "Content-Length header required",
+        "status_code": 400,
+        "details": {
+            "type": "MissingContentLength",
+            "description": (
+                f"Content-Length header is required for uploads. "
+                f"Maximum allowed size: {max_size_mb}MB"
+            ),
+            "max_size_mb": max_size_mb,
+            "suggestion": "Ensure your client sends Content-Length header",
+        },
+    }
+
+
+class SizeLimitedStream(io.RawIOBase):
+    """Stream wrapper that enforces size limits during reading.
+
+    Built on io.RawIOBase: read and readlines come from the C base class and
+    go through readinto/readall/readline, where the size is accounted for.
+    """
 
     def __init__(self, stream, max_size, logger=None):
+        super().__init__()
         self.stream = stream
         self.max_size = max_size
         self.bytes_read = 0
         self.logger = logger or logging.getLogger(__name__)
 
-    def read(self, size=-1):
-        if size == -1:
-            # Read all remaining bytes, but enforce limit
-            size = self.max_size - self.bytes_read + 1
-
-        data = self.stream.read(size)
-        self.bytes_read += len(data)
-
-        if self.bytes_read > self.max_size:
-            self.logger.warning(
-                f"Stream size limit exceeded: {self.bytes_read} bytes (max: {self.max_size} bytes)"
-            )
-            raise RequestEntityTooLarge(
-                f"Request entity too large: {self.bytes_read} bytes (max: {self.max_size} bytes)"
-            )
-
-        return data
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        # Never ask for more than one byte past the limit
+        size = min(len(b), self.max_size - self.bytes_read + 1)
+        if hasattr(self.stream, "readinto"):
+            # Fill the caller's buffer in place, even when capped below its size
+            count = self.stream.readinto(memoryview(b)[:size]) or 0
+        else:
+            data = self.stream.read(size)
+            count = len(data)
+            b[:count] = data
+
+        self._count(count)
+        return count
+
+    def readall(self):
+        # Read straight from the wrapped stream, skipping readinto's buffer copy
+        chunks = []
+        while True:
+            chunk = self.stream.read(self.max_size - self.bytes_read + 1)
+            if not chunk:
+                return b"".join(chunks)
+            self._count(len(chunk))
+            chunks.append(chunk)
 
     def readline(self, size=-1):
+        # Delegate so lines are not assembled one read(1) call at a time
+        limit = self.max_size - self.bytes_read + 1
+        if size is None or size < 0 or size > limit:
+            size = limit
         line = self.stream.readline(size)
-        self.bytes_read += len(line)
-
-        if self.bytes_read > self.max_size:
-            self.logger.warning(
-                f"Stream size limit exceeded during readline: {self.bytes_read} bytes"
-            )
-            raise RequestEntityTooLarge(
-                f"Request entity too large: {self.bytes_read} bytes (max: {self.max_size} bytes)"
-            )
-
+        self._count(len(line))
         return line
 
-    def readlines(self, hint=-1):
-        lines = self.stream.readlines(hint)
-        total_size = sum(len(line) for line in lines)
-        self.bytes_read += total_size
+    def _count(self, size):
+        self.bytes_read += size
 
         if self.bytes_read > self.max_size:
             self.logger.warning(
-                f"Stream size limit exceeded during readlines: {self.bytes_read} bytes"
+                "Stream size limit exceeded: %d bytes (max: %d bytes)",
+                self.bytes_read,
+                self.max_size,
             )
             raise RequestEntityTooLarge(
                 f"Request entity too large: {self.bytes_read} bytes (max: {self.max_size} bytes)"
             )
 
-        return lines
-
-    def __getattr__(self, name):
-        # Delegate other attributes to the wrapped stream
-        return getattr(self.stream, name)
+    def tell(self):
+        """Return the number of bytes read through the wrapper."""
+        return self.bytes_read
 
 
 class SizeValidationMiddleware:
     """WSGI middleware that enforces request size limits at the WSGI level."""
 
-    def __init__(self, app, max_size_bytes, logger=None):
+    def __init__(self, app, max_size_bytes, logger=None, skip_paths=("/ready",)):
         self.app = app
         self.max_size_bytes = max_size_bytes
         self.logger = logger or logging.getLogger(__name__)
+        # Bodiless endpoints such as the readiness probe bypass all checks
+        self.skip_paths = frozenset(skip_paths)
+        self._error_body = self._build_error_body()
+        # Everything before the closing braces of "details" and the body, so
+        # received_size_mb can be spliced in without re-serializing
+        self._error_prefix = self._error_body[:-2]
 
     def __call__(self, environ, start_response):
-        # Check Content-Length if present
-        content_length = environ.get("CONTENT_LENGTH")
-        if content_length:
-            try:
-                content_length = int(content_length)
-                if content_length > self.max_size_bytes:
-                    self.logger.warning(
-                        f"WSGI middleware rejected large request: {content_length} bytes"
-                    )
-                    # Return 413 response
-                    response = self._create_error_response(content_length)
-                    start_response(
-                        "413 Payload Too Large",
-                        [
-                            ("Content-Type", "application/json"),
-                            ("Content-Length", str(len(response))),
-                        ],
-                    )
-                    return [response]
-            except ValueError:
-                pass  # Invalid Content-Length, let downstream handle it
+        if environ.get("PATH_INFO") in self.skip_paths:
+            return self.app(environ, start_response)
+
+        # Check Content-Length before wsgi.input is touched, so oversized
+        # requests are rejected without reading or wrapping the body. As in
+        # Werkzeug, chunked bodies have no length and invalid values read as 0
+        content_length = get_content_length(environ)
+        environ[CONTENT_LENGTH_ENVIRON_KEY] = content_length
+        if content_length is not None:
+            if content_length > self.max_size_bytes:
+                return self._reject(start_response, content_length)
+            # Werkzeug already stops reading at a declared length, so the
+            # limit only needs enforcing while reading unbounded bodies
+            return self.app(environ, start_response)
 
         # Wrap the input stream to enforce size limits during reading
         if "wsgi.input" in environ:
@@ -194,8 +215,35 @@ class SizeValidationMiddleware:
 
         return self.app(environ, start_response)
 
+    def _reject(self, start_response, content_length):
+        """Send the 413 response for a request with an oversized Content-Length."""
+        self.logger.warning(
+            "WSGI middleware rejected large request: %d bytes", content_length
+        )
+        response = self._create_error_response(content_length)
+        start_response(
+            "413 Payload Too Large",
+            [
+                ("Content-Type", "application/json"),
+                ("Content-Length", str(len(response))),
+            ],
+        )
+        return [response]
+
     def _create_error_response(self, received_size=None):
         """Create a JSON error response for oversized requests."""
+        if not received_size:
+            return self._error_body
+
+        received_size_mb = json.dumps(round(received_size / (1024 * 1024), 2))
+        return b"%s, %s: %s}}" % (
+            self._error_prefix,
+            b'"received_size_mb"',
+            received_size_mb.encode("utf-8"),
+        )
+
+    def _build_error_body(self):
+        """Serialize the 413 body shared by every rejection."""
         max_size_mb = self.max_size_bytes / (1024 * 1024)
         response_data = {
             "error": True,
@@ -209,11 +257,4 @@ class SizeValidationMiddleware:
             },
         }
 
-        if received_size:
-            response_data["details"]["received_size_mb"] = round(
-                received_size / (1024 * 1024), 2
-            )
-
-        import json
-
         return json.dumps(response_data).encode("utf-8")